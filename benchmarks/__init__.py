@@ -0,0 +1 @@
+"""Benchmarks for test_app."""
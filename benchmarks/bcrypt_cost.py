@@ -0,0 +1,54 @@
+"""
+Login throughput per core for different bcrypt work factors.
+
+Login cost is dominated by a single bcrypt.checkpw call,
+so the benchmark verifies a password against hashes made
+with each work factor in one thread.
+
+Usage::
+
+    python -m benchmarks.bcrypt_cost --rounds 10 11 12 13
+"""
+
+import argparse
+import time
+
+import bcrypt
+
+PASSWORD = b"VedroKumisa"
+
+
+def logins_per_second(rounds: int, duration: float) -> float:
+    """
+    Measures password verifications per second on one core.
+
+    :param rounds: bcrypt work factor.
+    :param duration: minimal measuring time in seconds.
+    :return: verifications per second.
+    """
+    hashed_password = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+    iterations = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration or iterations < 3:
+        bcrypt.checkpw(PASSWORD, hashed_password)
+        iterations += 1
+        elapsed = time.perf_counter() - started
+    return iterations / elapsed
+
+
+def main() -> None:
+    """Prints login throughput table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'logins/s/core':>14} {'ms/login':>9}")  # noqa: T201
+    for rounds in args.rounds:
+        rate = logins_per_second(rounds, args.duration)
+        print(f"{rounds:>6} {rate:>14.1f} {1000 / rate:>9.1f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
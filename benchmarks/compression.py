@@ -0,0 +1,132 @@
+"""
+CPU time versus transferred bytes of task list compression levels.
+
+A task list with long descriptions is encoded like the API does,
+then compressed with every level. Transfer time is estimated
+for the given link bandwidth, so the total shows which level
+gives the fastest response on that link.
+
+Usage::
+
+    python -m benchmarks.compression --tasks 500 --bandwidth 2
+"""
+
+import argparse
+import random
+import string
+import time
+from functools import partial
+from typing import Callable, Iterator
+
+import ujson
+
+from test_app.web.middlewares.compression import (
+    BrotliCompressor,
+    GzipCompressor,
+    brotli,
+)
+
+STATUSES = ("TODO", "InProgress", "Done")
+
+
+def task_list(tasks: int, description_size: int) -> bytes:
+    """
+    Builds JSON body of the task list.
+
+    :param tasks: number of tasks.
+    :param description_size: approximate length of descriptions in characters.
+    :return: encoded body.
+    """
+    rng = random.Random(0)  # noqa: S311
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(2000)
+    ]
+    body = []
+    for index in range(tasks):
+        description: list[str] = []
+        while sum(map(len, description)) < description_size:
+            description.append(rng.choice(words))
+        body.append(
+            {
+                "title": f"Task {index}",
+                "description": " ".join(description),
+                "status": rng.choice(STATUSES),
+            },
+        )
+    return ujson.dumps(body).encode()
+
+
+def gzip_compress(level: int, data: bytes) -> bytes:
+    """Compresses whole body with gzip."""
+    return GzipCompressor(level).finish(data)
+
+
+def brotli_compress(quality: int, data: bytes) -> bytes:
+    """Compresses whole body with brotli."""
+    return BrotliCompressor(quality).finish(data)
+
+
+def compressors() -> Iterator[tuple[str, int, Callable[[bytes], bytes]]]:
+    """Yields encoding, level and compression function."""
+    for level in (1, 3, 6, 9):
+        yield "gzip", level, partial(gzip_compress, level)
+    if brotli is None:
+        return
+    for quality in (1, 4, 6, 11):
+        yield "br", quality, partial(brotli_compress, quality)
+
+
+def compression_time(compress: Callable[[bytes], bytes], body: bytes) -> float:
+    """
+    Measures seconds spent on compressing the body.
+
+    :param compress: compression function.
+    :param body: response body.
+    :return: best time of several runs.
+    """
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        compress(body)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    """Prints compression table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--description-size", type=int, default=1000)
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=2.0,
+        help="link bandwidth in Mbit/s",
+    )
+    args = parser.parse_args()
+    body = task_list(args.tasks, args.description_size)
+    bytes_per_ms = args.bandwidth * 1_000_000 / 8 / 1000
+    if brotli is None:
+        print("brotli is not installed, only gzip is measured")  # noqa: T201
+
+    print(  # noqa: T201
+        f"{'encoding':>8} {'level':>5} {'bytes':>10} {'ratio':>6} "
+        f"{'cpu ms':>8} {'MB/s':>7} {'transfer ms':>12} {'total ms':>9}",
+    )
+    rows = [("identity", 0, body, 0.0)]
+    for encoding, level, compress in compressors():
+        rows.append((encoding, level, compress(body), compression_time(compress, body)))
+    for encoding, level, compressed, seconds in rows:
+        cpu_ms = seconds * 1000
+        transfer_ms = len(compressed) / bytes_per_ms
+        speed = len(body) / seconds / 1_000_000 if seconds else float("inf")
+        print(  # noqa: T201
+            f"{encoding:>8} {level:>5} {len(compressed):>10} "
+            f"{len(body) / len(compressed):>6.2f} {cpu_ms:>8.2f} {speed:>7.1f} "
+            f"{transfer_ms:>12.1f} {cpu_ms + transfer_ms:>9.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
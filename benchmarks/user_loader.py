@@ -0,0 +1,103 @@
+"""
+Database queries per second with and without the batching user loader.
+
+Concurrent clients authenticate in a loop, each loading a random user
+by id in its own session, like authenticated requests do. The number
+of statements sent to the database is counted with an engine event.
+
+Requires a database configured with TEST_APP_DB_* variables.
+
+Usage::
+
+    python -m benchmarks.user_loader --clients 200 --duration 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# DAO modules can only be imported after the API.
+import test_app.web.application  # noqa: F401
+from test_app.db.dao import UserDAO
+from test_app.db.loaders import user_loader
+from test_app.settings import settings
+
+
+async def run(
+    use_loader: bool,
+    clients: int,
+    duration: float,
+    users: int,
+) -> tuple[float, float]:
+    """
+    Measures lookups and queries per second.
+
+    :param use_loader: whether to batch lookups with the user loader.
+    :param clients: number of concurrent clients.
+    :param duration: measuring time in seconds.
+    :param users: lookups are spread over this many user ids.
+    :return: lookups per second and queries per second.
+    """
+    engine = create_async_engine(
+        str(settings.db_url),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    queries = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(*args: object) -> None:
+        nonlocal queries
+        queries += 1
+
+    if use_loader:
+        user_loader.configure(
+            session_factory,
+            batch_size=settings.user_loader_batch_size,
+            window=settings.user_loader_window_seconds,
+        )
+    lookups = 0
+    deadline = time.perf_counter() + duration
+
+    async def client() -> None:
+        nonlocal lookups
+        while time.perf_counter() < deadline:
+            user_id = random.randint(1, users)  # noqa: S311
+            async with session_factory() as session:
+                await UserDAO(session).get_user_by_id(user_id)
+            lookups += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client() for _ in range(clients)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await user_loader.close()
+        await engine.dispose()
+    return lookups / elapsed, queries / elapsed
+
+
+def main() -> None:
+    """Prints throughput table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'loader':>6} {'lookups/s':>10} {'queries/s':>10}")  # noqa: T201
+    for use_loader in (False, True):
+        lookups, queries = asyncio.run(
+            run(use_loader, args.clients, args.duration, args.users),
+        )
+        label = "on" if use_loader else "off"
+        print(f"{label:>6} {lookups:>10.1f} {queries:>10.1f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Copies existing tasks to the partitioned task table.
+
+Run it between the migrations creating the partitioned table
+(5c2e8a4b1f03) and replacing task with it (8d41f6e9a2b7).
+New writes are copied by a trigger, this copies older rows
+in small transactions, so the application keeps working::
+
+    alembic upgrade 5c2e8a4b1f03
+    python -m test_app.db.backfill --batch-size 1000
+    alembic upgrade head
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from test_app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Source rows are locked, so a concurrent delete can't be
+# resurrected by copying the row version read before it.
+BACKFILL_BATCH = text(
+    """
+    WITH batch AS (
+        SELECT id, title, description, status, user_id FROM task
+        WHERE id > :last_id ORDER BY id LIMIT :batch_size FOR SHARE
+    ), copied AS (
+        INSERT INTO task_partitioned (id, title, description, status, user_id)
+        SELECT * FROM batch
+        ON CONFLICT (id, user_id) DO NOTHING
+    )
+    SELECT max(id), count(*) FROM batch
+    """,
+)
+
+
+async def backfill_task_partitions(engine: AsyncEngine, batch_size: int) -> int:
+    """
+    Copies tasks to the partitioned table batch by batch.
+
+    :param engine: engine of the database to backfill.
+    :param batch_size: rows copied per transaction.
+    :return: number of processed rows.
+    """
+    last_id, processed = 0, 0
+    while True:
+        async with engine.begin() as connection:
+            result = await connection.execute(
+                BACKFILL_BATCH,
+                {"last_id": last_id, "batch_size": batch_size},
+            )
+            max_id, count = result.one()
+        if not count:
+            return processed
+        last_id, processed = max_id, processed + count
+
+
+async def main(batch_size: int) -> None:
+    """Backfills the main database and every task shard."""
+    for url in (str(settings.db_url), *settings.db_task_shard_urls):
+        engine = create_async_engine(url)
+        try:
+            processed = await backfill_task_partitions(engine, batch_size)
+        finally:
+            await engine.dispose()
+        logger.info("Backfilled %d tasks in %s", processed, engine.url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args().batch_size))
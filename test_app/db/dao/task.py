@@ -1,23 +1,32 @@
+import asyncio
 from typing import TYPE_CHECKING, Sequence
 
 from fastapi import Depends
-from sqlalchemy import ScalarResult, select
+from sqlalchemy import ScalarResult, delete, select, update
 
-from test_app.db.dependencies import get_db_session
-from test_app.db.models.tasks import Task
+from test_app.db.models.tasks import Task, TaskArchive
+from test_app.db.shards import task_shards
+from test_app.db.singleflight import SingleFlight
+from test_app.services.tasks.dependecies import get_task_session
 from test_app.utils.task_status import TaskStatus
 from test_app.web.api.tasks.schema import TaskBase, TaskUpdatePartial
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+_all_tasks_flight: SingleFlight[list[Task | TaskArchive]] = SingleFlight("all_tasks")
+
 
 class TaskDAO:
-    """Class for accessing task table."""
+    """
+    Class for accessing task table.
+
+    The session is bound to the database holding current user's tasks.
+    """
 
     def __init__(
         self,
-        session: "AsyncSession" = Depends(get_db_session),
+        session: "AsyncSession" = Depends(get_task_session),
     ) -> None:
         self.session = session
 
@@ -34,37 +43,125 @@ class TaskDAO:
             user_id=user_id,
         )
         self.session.add(task)
+        # Assigns id, so the task can be referenced before commit.
+        await self.session.flush()
         return task
 
-    async def get_task_by_id(self, task_id: int) -> Task | None:
-        """Gets task object by id."""
+    async def get_task_by_id(
+        self,
+        task_id: int,
+        user_id: int | None = None,
+    ) -> Task | None:
+        """
+        Gets task object by id.
+
+        Task of known user is read from a single partition.
+        """
         stmt = select(Task).where(Task.id == task_id)
+        if user_id is not None:
+            stmt = stmt.where(Task.user_id == user_id)
         return await self.session.scalar(stmt)
 
-    async def get_all_tasks(
+    async def _select_tasks(
         self,
+        session: "AsyncSession",
         status: TaskStatus | None,
-    ) -> Sequence[Task]:
-        """Gets all tasks with optional filter by status."""
+        include_archived: bool,
+    ) -> list[Task | TaskArchive]:
         stmt = (
             select(Task)
             if status is None
             else select(Task).where(Task.status == status)
         )
-        result: ScalarResult[Task] = await self.session.scalars(stmt)
-        return list(result.all())
+        result: ScalarResult[Task] = await session.scalars(stmt)
+        tasks: list[Task | TaskArchive] = list(result.all())
+        # Only done tasks are archived.
+        if include_archived and status in {None, TaskStatus.DONE}:
+            tasks.extend(await session.scalars(select(TaskArchive)))
+        return tasks
+
+    async def _select_shard_tasks(
+        self,
+        shard: int,
+        status: TaskStatus | None,
+        include_archived: bool,
+    ) -> list[Task | TaskArchive]:
+        async with task_shards.session(shard) as session:
+            return await self._select_tasks(session, status, include_archived)
+
+    async def _select_all_tasks(
+        self,
+        status: TaskStatus | None,
+        include_archived: bool,
+    ) -> list[Task | TaskArchive]:
+        if not task_shards.configured:
+            return await self._select_tasks(self.session, status, include_archived)
+        # Tasks of all users are spread over the shards.
+        shards_tasks = await asyncio.gather(
+            *(
+                self._select_shard_tasks(shard, status, include_archived)
+                for shard in range(len(task_shards))
+            ),
+        )
+        return [task for tasks in shards_tasks for task in tasks]
+
+    async def get_all_tasks(
+        self,
+        status: TaskStatus | None,
+        include_archived: bool = False,
+    ) -> Sequence[Task | TaskArchive]:
+        """
+        Gets all tasks with optional filter by status.
+
+        Archived tasks are read from the archive table only on request.
+        Concurrent calls with the same filter share a single query.
+        """
+        tasks = await _all_tasks_flight.do(
+            (status, include_archived),
+            lambda: self._select_all_tasks(status, include_archived),
+        )
+        return [
+            task if task in self.session else await self.session.merge(task, load=False)
+            for task in tasks
+        ]
 
     async def update_task(
         self,
-        target_task: Task,
+        task_id: int,
+        user_id: int,
         updated_task: TaskUpdatePartial,
         partial: bool = False,
-    ) -> Task:
-        """Updates task object."""
-        for name, value in updated_task.model_dump(exclude_unset=partial).items():
-            setattr(target_task, name, value)
-        return target_task
-
-    async def delete_task(self, task: Task) -> None:
-        """Deletes task from db table."""
-        return await self.session.delete(task)
+    ) -> Task | None:
+        """
+        Updates user's task in a single statement.
+
+        Ownership is checked in the WHERE clause, so None means
+        that the task doesn't exist or belongs to another user.
+        """
+        # Columns are not nullable, so explicit nulls mean "leave as is".
+        values = updated_task.model_dump(exclude_unset=partial, exclude_none=True)
+        if not values:
+            return await self.session.scalar(
+                select(Task).where(Task.id == task_id, Task.user_id == user_id),
+            )
+        stmt = (
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .values(**values)
+            .returning(Task)
+            .execution_options(populate_existing=True)
+        )
+        return await self.session.scalar(stmt)
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool:
+        """
+        Deletes user's task in a single statement.
+
+        :return: False if the task doesn't exist or belongs to another user.
+        """
+        stmt = (
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .returning(Task.id)
+        )
+        return await self.session.scalar(stmt) is not None
@@ -5,11 +5,16 @@ import bcrypt
 from fastapi import Depends
 from jwt import InvalidTokenError
 from redis.asyncio import Redis
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
 
 from test_app.db.dependencies import get_db_session
+from test_app.db.loaders import user_loader
 from test_app.db.models.users import User
+from test_app.db.singleflight import SingleFlight
 from test_app.services.redis.dependency import get_redis_pool
+from test_app.services.tracing.tracer import SpanKind, tracer
 from test_app.settings import settings
 from test_app.utils.auth import (
     REFRESH_JWT_TYPE,
@@ -23,6 +28,10 @@ if TYPE_CHECKING:
     from redis.asyncio import ConnectionPool
     from sqlalchemy.ext.asyncio import AsyncSession
 
+# Auth loads the user on every request, so the same user is often
+# requested by several concurrent requests.
+_user_by_id_flight: SingleFlight[User | None] = SingleFlight("user_by_id")
+
 
 class UserDAO:
     """Class for accessing user table."""
@@ -41,7 +50,7 @@ class UserDAO:
             return redis
 
     def _hash_password(self, password: str) -> str:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
         return ensure_str(bcrypt.hashpw(password=ensure_bytes(password), salt=salt))
 
     def _verify_password(
@@ -54,6 +63,28 @@ class UserDAO:
             ensure_bytes(hashed_password),
         )
 
+    def password_needs_rehash(self, user: User) -> bool:
+        """Checks that user's password hash was made with another work factor."""
+        # Bcrypt hashes look like $2b$<rounds>$<salt and hash>.
+        rounds = user.hashed_password.split("$")[2]
+        return int(rounds) != settings.bcrypt_rounds
+
+    async def rehash_password(self, user_id: int, password: str) -> None:
+        """
+        Updates user's password hash with current work factor.
+
+        It's meant to run as a background task after login,
+        so the changes are committed here.
+        """
+        with tracer.start_span("bcrypt.hash"):
+            hashed_password = await run_in_threadpool(self._hash_password, password)
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(hashed_password=hashed_password),
+        )
+        await self.session.commit()
+
     def _create_refresh_token_key(
         self,
         user_id: int,
@@ -77,40 +108,76 @@ class UserDAO:
         if not user:
             # Run the hasher to mitigate timing attack
             # Inspired from Django: https://code.djangoproject.com/ticket/20760
-            self._hash_password(password)
+            with tracer.start_span("bcrypt.hash"):
+                await run_in_threadpool(self._hash_password, password)
             return None
 
-        verified = self._verify_password(
-            plain_password=password,
-            hashed_password=user.hashed_password,
-        )
+        with tracer.start_span("bcrypt.verify"):
+            verified = await run_in_threadpool(
+                self._verify_password,
+                plain_password=password,
+                hashed_password=user.hashed_password,
+            )
         if verified:
             return user
         return None
 
-    async def get_user_by_id(self, user_id: int) -> User | None:
-        """Retrieve user by id."""
+    async def _select_user_by_id(self, user_id: int) -> User | None:
+        if user_loader.configured:
+            return await user_loader.load(user_id)
         stmt = select(User).where(User.id == user_id)
-        result = await self.session.scalars(stmt)
+        with tracer.start_span(
+            "UserDAO.get_user_by_id",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "postgresql", "db.operation": "SELECT"},
+        ):
+            result = await self.session.scalars(stmt)
         return result.one_or_none()
 
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        """
+        Retrieve user by id.
+
+        Concurrent calls for the same user share a single query
+        and, when the user loader is enabled, calls for different
+        users are batched into one query.
+        """
+        user = await _user_by_id_flight.do(
+            user_id,
+            lambda: self._select_user_by_id(user_id),
+        )
+        if user is None or user in self.session:
+            return user
+        # Loaded by another session, copies it without a query.
+        return await self.session.merge(user, load=False)
+
     async def create_user_model(
         self,
         user_create: UserCreate,
-    ) -> User | None:
+    ) -> User:
         """
-        Add single user to session.
+        Insert single user in one statement.
+
+        The username uniqueness is checked by the database,
+        so concurrent registrations can't both succeed.
 
         :param user_create: user credentials.
         :return: created user instance or raise exception.
         """
-        existing_user = await self.get_user_by_username(user_create.username)
-        if existing_user is not None:
+        with tracer.start_span("bcrypt.hash"):
+            hashed_password = await run_in_threadpool(
+                self._hash_password,
+                user_create.password,
+            )
+        stmt = (
+            insert(User)
+            .values(username=user_create.username, hashed_password=hashed_password)
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User)
+        )
+        user = await self.session.scalar(stmt)
+        if user is None:
             raise UserAlreadyExistsError
-
-        hashed_password = self._hash_password(user_create.password)
-        user = User(username=user_create.username, hashed_password=hashed_password)
-        self.session.add(user)
         return user
 
     async def _check_refresh_token_in_redis(
@@ -120,7 +187,12 @@ class UserDAO:
     ) -> str | None:
         redis = await self._get_redis()
         key = self._create_refresh_token_key(user_id, token)
-        return await redis.get(key)
+        with tracer.start_span(
+            "redis.get",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "redis", "db.operation": "GET"},
+        ):
+            return await redis.get(key)
 
     async def save_refresh_token_to_redis(
         self,
@@ -134,11 +206,16 @@ class UserDAO:
             user_id=user.id,
             token=token,
         )
-        await redis.setex(
-            name=key,
-            time=timedelta(days=expire_days),
-            value=0,
-        )
+        with tracer.start_span(
+            "redis.setex",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "redis", "db.operation": "SETEX"},
+        ):
+            await redis.setex(
+                name=key,
+                time=timedelta(days=expire_days),
+                value=0,
+            )
 
     async def _validate_token(
         self,
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Sequence
+
+from sqlalchemy import ARRAY, Integer, Select, any_, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from test_app.db.models.users import User
+from test_app.services.metrics.registry import metrics
+from test_app.services.tracing.tracer import SpanKind, tracer
+
+logger = logging.getLogger(__name__)
+
+user_loader_batch_size = metrics.histogram(
+    "user_loader_batch_size",
+    "Number of user ids resolved by a single query.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+
+def users_by_ids_stmt(user_ids: Sequence[int]) -> Select[tuple[User]]:
+    """
+    Builds query for users with given ids.
+
+    Ids are passed as a single array parameter, so the statement
+    is the same for any batch size and is prepared only once.
+    """
+    ids = bindparam("ids", list(user_ids), type_=ARRAY(Integer))
+    return select(User).where(User.id == any_(ids))
+
+
+class UserLoader:
+    """
+    Batches user lookups of concurrent requests into one query.
+
+    Ids requested within the window are loaded with a single
+    ``WHERE id = ANY(:ids)`` query in a separate session, so loaded
+    users are detached and don't see uncommitted changes of the caller.
+    A batch is sent earlier once it reaches the batch size.
+    """
+
+    def __init__(self) -> None:
+        self.batch_size = 100
+        self.window = 0.0
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._pending: dict[int, asyncio.Future[User | None]] = {}
+        self._dispatch_handle: asyncio.Handle | None = None
+        self._batches: set[asyncio.Task[None]] = set()
+
+    @property
+    def configured(self) -> bool:
+        """Whether the loader can be used."""
+        return self._session_factory is not None
+
+    def configure(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int,
+        window: float,
+    ) -> None:
+        """
+        Enables the loader.
+
+        :param session_factory: factory of sessions for batch queries.
+        :param batch_size: maximal number of ids in one query.
+        :param window: seconds to collect ids for, zero means one loop tick.
+        """
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.window = window
+
+    async def close(self) -> None:
+        """Waits for sent batches and disables the loader."""
+        if self._pending:
+            self._dispatch()
+        await asyncio.gather(*self._batches, return_exceptions=True)
+        self._session_factory = None
+
+    async def load(self, user_id: int) -> User | None:
+        """
+        Loads user by id as part of the next batch.
+
+        :param user_id: id of the user.
+        :return: detached user or None if there is no such user.
+        """
+        future = self._pending.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[user_id] = future
+            if len(self._pending) >= self.batch_size:
+                self._dispatch()
+            elif self._dispatch_handle is None:
+                self._dispatch_handle = (
+                    loop.call_later(self.window, self._dispatch)
+                    if self.window > 0
+                    else loop.call_soon(self._dispatch)
+                )
+        # Cancelling one caller mustn't fail the others waiting for the batch.
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._load_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _load_batch(
+        self,
+        batch: dict[int, asyncio.Future[User | None]],
+    ) -> None:
+        user_loader_batch_size.observe(len(batch))
+        try:
+            if self._session_factory is None:
+                raise RuntimeError("User loader is not configured")
+            with tracer.start_span(
+                "UserLoader.load_batch",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "db.system": "postgresql",
+                    "db.operation": "SELECT",
+                    "db.batch_size": len(batch),
+                },
+            ):
+                async with self._session_factory() as session:
+                    result = await session.scalars(users_by_ids_stmt(list(batch)))
+                    users = {user.id: user for user in result}
+        except Exception as error:
+            logger.warning("Failed to load batch of %d users", len(batch))
+            for future in batch.values():
+                future.set_exception(error)
+                # Marks exception as retrieved when the caller is gone.
+                future.exception()
+            return
+        for user_id, future in batch.items():
+            future.set_result(users.get(user_id))
+
+
+user_loader = UserLoader()
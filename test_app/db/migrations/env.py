@@ -31,6 +31,19 @@ target_metadata = meta
 # ... etc.
 
 
+def _databases() -> list[tuple[str, int | None]]:
+    """
+    Returns URLs of databases to migrate with their task shard indexes.
+
+    Migrations run against the main database and every task shard,
+    migrations read the index from config attributes.
+    """
+    return [
+        (str(settings.db_url), None),
+        *((url, shard) for shard, url in enumerate(settings.db_task_shard_urls)),
+    ]
+
+
 async def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -43,15 +56,17 @@ async def run_migrations_offline() -> None:
     script output.
 
     """
-    context.configure(
-        url=str(settings.db_url),
-        target_metadata=target_metadata,
-        literal_binds=True,
-        dialect_opts={"paramstyle": "named"},
-    )
+    for url, shard in _databases():
+        config.attributes["task_shard"] = shard
+        context.configure(
+            url=url,
+            target_metadata=target_metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+        )
 
-    with context.begin_transaction():
-        context.run_migrations()
+        with context.begin_transaction():
+            context.run_migrations()
 
 
 def do_run_migrations(connection: Connection) -> None:
@@ -73,16 +88,18 @@ async def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    connectable = create_async_engine(str(settings.db_url))
+    for url, shard in _databases():
+        config.attributes["task_shard"] = shard
+        connectable = create_async_engine(url)
 
-    async with connectable.connect() as connection:
-        await connection.run_sync(do_run_migrations)
+        async with connectable.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+        await connectable.dispose()
 
 
-loop = asyncio.get_event_loop()
 if context.is_offline_mode():
     task = run_migrations_offline()
 else:
     task = run_migrations_online()
 
-loop.run_until_complete(task)
+asyncio.run(task)
@@ -0,0 +1,53 @@
+"""shard tasks by user
+
+Revision ID: 3b9f2c1d7a64
+Revises: 720b0cd76c7d
+Create Date: 2026-10-19 10:12:41.208313
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3b9f2c1d7a64"
+down_revision = "720b0cd76c7d"
+branch_labels = None
+depends_on = None
+
+# Same as test_app.db.shards.MAX_TASK_SHARDS.
+MAX_TASK_SHARDS = 1024
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("task_shard", sa.SmallInteger(), nullable=True))
+
+    shard = context.config.attributes.get("task_shard")
+    if shard is None:
+        return
+    # Users are stored in the main database only.
+    op.drop_constraint("fk_task_user_id_user", "task", type_="foreignkey")
+    # Interleaves ids of shards, so moved tasks keep their ids.
+    op.execute(f"ALTER SEQUENCE task_id_seq INCREMENT BY {MAX_TASK_SHARDS}")
+    op.execute(
+        "SELECT setval('task_id_seq', "
+        f"(COALESCE(MAX(id), 0) / {MAX_TASK_SHARDS} + 1) * {MAX_TASK_SHARDS} "
+        f"+ {shard + 1}, false) FROM task",
+    )
+
+
+def downgrade() -> None:
+    shard = context.config.attributes.get("task_shard")
+    if shard is not None:
+        op.execute("ALTER SEQUENCE task_id_seq INCREMENT BY 1")
+        op.create_foreign_key(
+            "fk_task_user_id_user",
+            "task",
+            "user",
+            ["user_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+    op.drop_column("user", "task_shard")
@@ -0,0 +1,95 @@
+"""create partitioned task table
+
+The table is filled by a trigger mirroring writes to task
+and by backfill (python -m test_app.db.backfill),
+it replaces task in the next migration.
+
+Revision ID: 5c2e8a4b1f03
+Revises: 3b9f2c1d7a64
+Create Date: 2026-10-19 11:05:17.633540
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from test_app.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = "5c2e8a4b1f03"
+down_revision = "3b9f2c1d7a64"
+branch_labels = None
+depends_on = None
+
+SYNC_FUNCTION = """
+CREATE FUNCTION task_partitioned_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM task_partitioned WHERE id = OLD.id AND user_id = OLD.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_partitioned (id, title, description, status, user_id)
+        VALUES (NEW.id, NEW.title, NEW.description, NEW.status, NEW.user_id);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+SYNC_TRIGGER = """
+CREATE TRIGGER task_partitioned_sync
+AFTER INSERT OR UPDATE OR DELETE ON task
+FOR EACH ROW EXECUTE FUNCTION task_partitioned_sync()
+"""
+
+
+def upgrade() -> None:
+    shard = context.config.attributes.get("task_shard")
+    constraints: list[sa.Constraint] = [
+        sa.PrimaryKeyConstraint("id", "user_id", name="pk_task_partitioned"),
+    ]
+    if shard is None:
+        # Users are stored in the main database only.
+        constraints.append(
+            sa.ForeignKeyConstraint(
+                ["user_id"],
+                ["user.id"],
+                name="fk_task_partitioned_user_id_user",
+                ondelete="CASCADE",
+            ),
+        )
+    op.create_table(
+        "task_partitioned",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('task_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        *constraints,
+        postgresql_partition_by="HASH (user_id)",
+    )
+    partitions = settings.db_task_partitions
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE task_p{remainder} PARTITION OF task_partitioned "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})",
+        )
+    op.execute(SYNC_FUNCTION)
+    op.execute(SYNC_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER task_partitioned_sync ON task")
+    op.execute("DROP FUNCTION task_partitioned_sync()")
+    op.drop_table("task_partitioned")
@@ -0,0 +1,115 @@
+"""replace task with partitioned table
+
+Writes are blocked while rows missed by backfill are copied,
+so run the backfill first on big tables.
+
+Revision ID: 8d41f6e9a2b7
+Revises: 5c2e8a4b1f03
+Create Date: 2026-10-19 11:06:02.417905
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "8d41f6e9a2b7"
+down_revision = "5c2e8a4b1f03"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, title, description, status, user_id"
+
+# Same as in 5c2e8a4b1f03.
+SYNC_FUNCTION = """
+CREATE FUNCTION task_partitioned_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM task_partitioned WHERE id = OLD.id AND user_id = OLD.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_partitioned (id, title, description, status, user_id)
+        VALUES (NEW.id, NEW.title, NEW.description, NEW.status, NEW.user_id);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+SYNC_TRIGGER = """
+CREATE TRIGGER task_partitioned_sync
+AFTER INSERT OR UPDATE OR DELETE ON task
+FOR EACH ROW EXECUTE FUNCTION task_partitioned_sync()
+"""
+
+
+def upgrade() -> None:
+    shard = context.config.attributes.get("task_shard")
+    # Blocks writes, reads keep working.
+    op.execute("LOCK TABLE task IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        f"INSERT INTO task_partitioned ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM task t WHERE NOT EXISTS ("
+        "SELECT 1 FROM task_partitioned p "
+        "WHERE p.id = t.id AND p.user_id = t.user_id)",
+    )
+    op.execute("DROP TRIGGER task_partitioned_sync ON task")
+    op.execute("DROP FUNCTION task_partitioned_sync()")
+    op.execute("ALTER SEQUENCE task_id_seq OWNED BY task_partitioned.id")
+    op.drop_table("task")
+    op.rename_table("task_partitioned", "task")
+    op.execute("ALTER TABLE task RENAME CONSTRAINT pk_task_partitioned TO pk_task")
+    if shard is None:
+        op.execute(
+            "ALTER TABLE task RENAME CONSTRAINT "
+            "fk_task_partitioned_user_id_user TO fk_task_user_id_user",
+        )
+
+
+def downgrade() -> None:
+    shard = context.config.attributes.get("task_shard")
+    op.rename_table("task", "task_partitioned")
+    op.execute(
+        "ALTER TABLE task_partitioned RENAME CONSTRAINT pk_task TO pk_task_partitioned"
+    )
+    if shard is None:
+        op.execute(
+            "ALTER TABLE task_partitioned RENAME CONSTRAINT "
+            "fk_task_user_id_user TO fk_task_partitioned_user_id_user",
+        )
+    constraints: list[sa.Constraint] = [sa.PrimaryKeyConstraint("id", name="pk_task")]
+    if shard is None:
+        constraints.append(
+            sa.ForeignKeyConstraint(
+                ["user_id"],
+                ["user.id"],
+                name="fk_task_user_id_user",
+                ondelete="CASCADE",
+            ),
+        )
+    op.create_table(
+        "task",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('task_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        *constraints,
+    )
+    op.execute(
+        f"INSERT INTO task ({COLUMNS}) SELECT {COLUMNS} FROM task_partitioned",
+    )
+    op.execute("ALTER SEQUENCE task_id_seq OWNED BY task.id")
+    op.execute(SYNC_FUNCTION)
+    op.execute(SYNC_TRIGGER)
@@ -0,0 +1,83 @@
+"""add task archive
+
+Revision ID: b7e3d05c9a18
+Revises: 8d41f6e9a2b7
+Create Date: 2026-10-19 13:40:55.120398
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e3d05c9a18"
+down_revision = "8d41f6e9a2b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    shard = context.config.attributes.get("task_shard")
+    op.add_column(
+        "task",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_task_done_updated_at",
+        "task",
+        ["updated_at"],
+        postgresql_where=sa.text("status = 'DONE'"),
+    )
+
+    constraints: list[sa.Constraint] = [
+        sa.PrimaryKeyConstraint("id", "user_id", name=op.f("pk_task_archive")),
+    ]
+    if shard is None:
+        # Users are stored in the main database only.
+        constraints.append(
+            sa.ForeignKeyConstraint(
+                ["user_id"],
+                ["user.id"],
+                name=op.f("fk_task_archive_user_id_user"),
+                ondelete="CASCADE",
+            ),
+        )
+    op.create_table(
+        "task_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        *constraints,
+    )
+    op.create_index(
+        op.f("ix_task_archive_user_id"),
+        "task_archive",
+        ["user_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_task_archive_user_id"), table_name="task_archive")
+    op.drop_table("task_archive")
+    op.drop_index("ix_task_done_updated_at", table_name="task")
+    op.drop_column("task", "updated_at")
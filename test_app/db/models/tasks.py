@@ -1,17 +1,94 @@
-from sqlalchemy import Enum, ForeignKey, String, Text
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from test_app.db.base import Base
+from test_app.settings import settings
 from test_app.utils.task_status import TaskStatus
 
 
 class Task(Base):
-    """Represents task entity."""
+    """
+    Represents task entity.
+
+    The table is hash partitioned by user_id, so queries
+    filtered by user read a single partition.
+    """
 
     __tablename__ = "task"
+    __table_args__ = (
+        # Done tasks waiting for the archiver.
+        Index(
+            "ix_task_done_updated_at",
+            "updated_at",
+            postgresql_where=text(f"status = '{TaskStatus.DONE.name}'"),
+        ),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(length=200))
     description: Mapped[str] = mapped_column(Text)
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus))
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
+    # Partition key has to be a part of the primary key.
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class TaskArchive(Base):
+    """Represents done task moved out of the task table."""
+
+    __tablename__ = "task_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(String(length=200))
+    description: Mapped[str] = mapped_column(Text)
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
+
+def task_partitions_ddl(table: str, partitions: int) -> list[str]:
+    """
+    Returns statements creating hash partitions of a task table.
+
+    :param table: name of partitioned table.
+    :param partitions: number of partitions.
+    :return: list of statements.
+    """
+    return [
+        f"CREATE TABLE task_p{remainder} PARTITION OF {table} "
+        f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        for remainder in range(partitions)
+    ]
+
+
+for _statement in task_partitions_ddl("task", settings.db_task_partitions):
+    event.listen(Task.__table__, "after_create", DDL(_statement))
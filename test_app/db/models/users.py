@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String
+from sqlalchemy import Integer, SmallInteger, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from test_app.db.base import Base
@@ -22,3 +22,8 @@ class User(Base):
         String(length=1024),
         nullable=False,
     )
+    # Shard holding user's tasks when it differs from the hashed one.
+    task_shard: Mapped[int | None] = mapped_column(
+        SmallInteger,
+        nullable=True,
+    )
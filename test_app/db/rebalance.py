@@ -0,0 +1,219 @@
+"""
+Moves users' tasks between task shards.
+
+Adding a shard changes the hashed shard of some users, so the
+shard count is changed in three steps::
+
+    # 1. Pin every user to the shard currently holding their tasks.
+    python -m test_app.db.rebalance pin
+    # 2. Add the new shard URL to TEST_APP_DB_TASK_SHARD_URLS,
+    #    run migrations and restart the application.
+    # 3. Move pinned users to their hashed shards, in batches if needed.
+    python -m test_app.db.rebalance rebalance --limit 1000
+
+Single user is moved with::
+
+    python -m test_app.db.rebalance move USER_ID SHARD
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from test_app.db.models.tasks import Task, TaskArchive
+from test_app.db.models.users import User
+from test_app.db.shards import task_shards
+from test_app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskMoveError(Exception):
+    """Tasks can't be moved."""
+
+
+async def _sync_user_rows(
+    source: AsyncSession,
+    target: AsyncSession,
+    model: type[Task] | type[TaskArchive],
+    user_id: int,
+) -> int:
+    table = model.__table__
+    stmt = select(table).where(table.c.user_id == user_id)
+    rows = (await source.execute(stmt)).mappings().all()
+    ids = [row["id"] for row in rows]
+    await target.execute(
+        delete(model).where(table.c.user_id == user_id, table.c.id.not_in(ids)),
+    )
+    if rows:
+        insert_stmt = insert(model).values([dict(row) for row in rows])
+        upsert = insert_stmt.on_conflict_do_update(
+            index_elements=[table.c.id, table.c.user_id],
+            set_={
+                column.name: insert_stmt.excluded[column.name]
+                for column in table.columns
+                if not column.primary_key
+            },
+        )
+        await target.execute(upsert)
+    return len(rows)
+
+
+async def _sync_user_tasks(
+    source: AsyncSession,
+    target: AsyncSession,
+    user_id: int,
+) -> int:
+    """
+    Makes user's tasks in target shard the same as in source one.
+
+    :return: number of copied tasks, archived ones included.
+    """
+    copied = 0
+    for model in (Task, TaskArchive):
+        copied += await _sync_user_rows(source, target, model, user_id)
+    await target.commit()
+    return copied
+
+
+async def move_user(primary: AsyncSession, user_id: int, target: int) -> int:
+    """
+    Moves user's tasks to the target shard.
+
+    Tasks are copied, then the user is routed to the target shard
+    and tasks are copied again to catch writes racing the switch,
+    after that tasks are deleted from the source shard.
+
+    :param primary: session to the main database.
+    :param user_id: id of the user.
+    :param target: index of target shard.
+    :return: number of moved tasks.
+    """
+    user = await primary.scalar(
+        select(User)
+        .where(User.id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True),
+    )
+    if user is None:
+        raise TaskMoveError(f"User {user_id} doesn't exist")
+    source = task_shards.shard_for(user)
+    if source == target:
+        await primary.commit()
+        return 0
+
+    src, dst = task_shards.session(source), task_shards.session(target)
+    async with src, dst:
+        await _sync_user_tasks(src, dst, user_id)
+        # Hashed users don't need to be pinned.
+        user.task_shard = (
+            None if task_shards.hashed_shard(user_id) == target else target
+        )
+        await primary.commit()
+        moved = await _sync_user_tasks(src, dst, user_id)
+        await src.execute(delete(Task).where(Task.user_id == user_id))
+        await src.execute(delete(TaskArchive).where(TaskArchive.user_id == user_id))
+        await src.commit()
+    logger.info("Moved %d tasks of user %d to shard %d", moved, user_id, target)
+    return moved
+
+
+async def pin_users(primary: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Pins users to shards currently holding their tasks.
+
+    :param primary: session to the main database.
+    :param batch_size: users updated per transaction.
+    :return: number of pinned users.
+    """
+    pinned = 0
+    last_id = 0
+    while True:
+        user_ids = (
+            await primary.scalars(
+                select(User.id)
+                .where(User.id > last_id, User.task_shard.is_(None))
+                .order_by(User.id)
+                .limit(batch_size),
+            )
+        ).all()
+        if not user_ids:
+            return pinned
+        await primary.execute(
+            update(User),
+            [
+                {"id": user_id, "task_shard": task_shards.hashed_shard(user_id)}
+                for user_id in user_ids
+            ],
+        )
+        await primary.commit()
+        pinned += len(user_ids)
+        last_id = user_ids[-1]
+
+
+async def rebalance(primary: AsyncSession, limit: int | None = None) -> int:
+    """
+    Moves pinned users to their hashed shards.
+
+    :param primary: session to the main database.
+    :param limit: maximal number of users to move.
+    :return: number of moved users.
+    """
+    stmt = select(User.id, User.task_shard).where(User.task_shard.is_not(None))
+    moved = 0
+    for user_id, shard in (await primary.execute(stmt.order_by(User.id))).all():
+        if limit is not None and moved >= limit:
+            break
+        hashed_shard = task_shards.hashed_shard(user_id)
+        if shard == hashed_shard:
+            await primary.execute(
+                update(User).where(User.id == user_id).values(task_shard=None),
+            )
+            await primary.commit()
+            continue
+        await move_user(primary, user_id, hashed_shard)
+        moved += 1
+    await primary.commit()
+    return moved
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Runs rebalancing command."""
+    if not settings.db_task_shard_urls:
+        raise SystemExit("Task shards are not configured")
+    task_shards.configure(settings.db_task_shard_urls)
+    engine = create_async_engine(str(settings.db_url))
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as primary:
+            if args.command == "move":
+                await move_user(primary, args.user_id, args.shard)
+            elif args.command == "pin":
+                logger.info("Pinned %d users", await pin_users(primary))
+            else:
+                logger.info("Moved %d users", await rebalance(primary, args.limit))
+    finally:
+        await engine.dispose()
+        await task_shards.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    move_parser = commands.add_parser("move", help="move user to the shard")
+    move_parser.add_argument("user_id", type=int)
+    move_parser.add_argument("shard", type=int)
+    commands.add_parser("pin", help="pin users to their current shards")
+    rebalance_parser = commands.add_parser(
+        "rebalance",
+        help="move pinned users to their hashed shards",
+    )
+    rebalance_parser.add_argument("--limit", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from test_app.db.models.users import User
+
+# Task ids are interleaved between shards: shard N allocates ids
+# N + 1, N + 1 + MAX_TASK_SHARDS, ... so tasks keep their ids
+# when moved to another shard.
+MAX_TASK_SHARDS = 1024
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Maps key to one of the buckets with jump consistent hash.
+
+    When the number of buckets grows from N to N + 1,
+    only 1 / (N + 1) of keys move to the new bucket.
+
+    :param key: non-negative integer key.
+    :param buckets: number of buckets.
+    :return: bucket index.
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+class TaskShards:
+    """
+    Databases holding tasks, when tasks are sharded by user.
+
+    A user's tasks are stored in the shard chosen by the hash of
+    the user id, unless the user is pinned to a shard explicitly
+    with ``user.task_shard``, which is how users are moved.
+    """
+
+    def __init__(self) -> None:
+        self.engines: list[AsyncEngine] = []
+        self._session_factories: list[async_sessionmaker[AsyncSession]] = []
+
+    @property
+    def configured(self) -> bool:
+        """Whether tasks are sharded."""
+        return bool(self.engines)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def configure(self, urls: list[str], **engine_kwargs: Any) -> None:
+        """
+        Creates engines of the shards.
+
+        :param urls: database URLs, the order defines shard indexes.
+        :param engine_kwargs: arguments for every engine.
+        """
+        if len(urls) > MAX_TASK_SHARDS:
+            raise ValueError(f"At most {MAX_TASK_SHARDS} task shards are supported")
+        self.engines = [create_async_engine(url, **engine_kwargs) for url in urls]
+        self._session_factories = [
+            async_sessionmaker(engine, expire_on_commit=False)
+            for engine in self.engines
+        ]
+
+    async def dispose(self) -> None:
+        """Closes connections of all shards."""
+        for engine in self.engines:
+            await engine.dispose()
+        self.engines = []
+        self._session_factories = []
+
+    def hashed_shard(self, user_id: int) -> int:
+        """Returns shard chosen for user by the hash of the id."""
+        return jump_hash(user_id, len(self.engines))
+
+    def shard_for(self, user: User) -> int:
+        """Returns shard holding user's tasks."""
+        if user.task_shard is not None:
+            return user.task_shard
+        return self.hashed_shard(user.id)
+
+    def session(self, shard: int) -> AsyncSession:
+        """Creates session to the shard."""
+        return self._session_factories[shard]()
+
+
+task_shards = TaskShards()
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from test_app.services.metrics.registry import metrics
+
+T = TypeVar("T")
+
+singleflight_calls = metrics.counter(
+    "singleflight_calls",
+    "Coalesced reads by role: leaders run the query, followers share its result.",
+    labelnames=("name", "role"),
+)
+
+
+class _LeaderCancelledError(Exception):
+    """Leader call was cancelled before it got a result."""
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    The first caller runs the call, callers arriving while it's
+    in flight wait for it and get the same result. Nothing is kept
+    after the call finishes, so it's not a cache: callers that join
+    may get a result of a query started slightly before they asked.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs the call or joins the in-flight one with the same key.
+
+        :param key: identity of the call.
+        :param call: function making the call.
+        :return: result of the call.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            singleflight_calls.inc(name=self.name, role="follower")
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelledError:
+                return await self.do(key, call)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        singleflight_calls.inc(name=self.name, role="leader")
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # Followers shouldn't fail because the leader's client went away.
+            future.set_exception(_LeaderCancelledError())
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if future.done() and not future.cancelled():
+                # Marks exception as retrieved when there are no followers.
+                future.exception()
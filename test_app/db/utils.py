@@ -5,40 +5,50 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from test_app.settings import settings
 
 
-async def create_database() -> None:
-    """Create a database."""
+async def create_database(name: str | None = None) -> None:
+    """
+    Create a database.
+
+    :param name: database name, the configured one by default.
+    """
+    name = name or settings.db_base
     db_url = make_url(str(settings.db_url.with_path("/postgres")))
     engine = create_async_engine(db_url, isolation_level="AUTOCOMMIT")
 
     async with engine.connect() as conn:
         database_existance = await conn.execute(
             text(
-                f"SELECT 1 FROM pg_database WHERE datname='{settings.db_base}'",  # noqa: S608
+                f"SELECT 1 FROM pg_database WHERE datname='{name}'",  # noqa: S608
             ),
         )
         database_exists = database_existance.scalar() == 1
 
     if database_exists:
-        await drop_database()
+        await drop_database(name)
 
     async with engine.connect() as conn:
         await conn.execute(
             text(
-                f'CREATE DATABASE "{settings.db_base}" ENCODING "utf8" TEMPLATE template1',  # noqa: E501
+                f'CREATE DATABASE "{name}" ENCODING "utf8" TEMPLATE template1',
             ),
         )
 
 
-async def drop_database() -> None:
-    """Drop current database."""
+async def drop_database(name: str | None = None) -> None:
+    """
+    Drop a database.
+
+    :param name: database name, the configured one by default.
+    """
+    name = name or settings.db_base
     db_url = make_url(str(settings.db_url.with_path("/postgres")))
     engine = create_async_engine(db_url, isolation_level="AUTOCOMMIT")
     async with engine.connect() as conn:
         disc_users = (
             "SELECT pg_terminate_backend(pg_stat_activity.pid) "  # noqa: S608
             "FROM pg_stat_activity "
-            f"WHERE pg_stat_activity.datname = '{settings.db_base}' "
+            f"WHERE pg_stat_activity.datname = '{name}' "
             "AND pid <> pg_backend_pid();"
         )
         await conn.execute(text(disc_users))
-        await conn.execute(text(f'DROP DATABASE "{settings.db_base}"'))
+        await conn.execute(text(f'DROP DATABASE "{name}"'))
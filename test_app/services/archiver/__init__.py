@@ -0,0 +1 @@
+"""Archival of done tasks."""
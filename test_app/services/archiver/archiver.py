@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import Insert, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from test_app.db.models.tasks import Task, TaskArchive
+from test_app.services.metrics.registry import metrics
+from test_app.utils.task_status import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+archived_tasks = metrics.counter(
+    "task_archiver_tasks",
+    "Done tasks moved to the archive.",
+)
+archived_tasks_per_run = metrics.histogram(
+    "task_archiver_run_tasks",
+    "Done tasks moved to the archive by a single run.",
+    buckets=(0, 10, 100, 1_000, 10_000, 100_000),
+)
+archiver_runs = metrics.counter(
+    "task_archiver_runs",
+    "Archiver runs by result.",
+    labelnames=("result",),
+)
+
+ARCHIVED_COLUMNS = ("id", "title", "description", "status", "user_id", "updated_at")
+
+
+def archive_batch_stmt(min_age: timedelta, batch_size: int) -> Insert:
+    """
+    Builds statement moving a batch of old done tasks to the archive.
+
+    Rows locked by requests or other workers are skipped,
+    so archivers of all workers can run at the same time.
+
+    :param min_age: time since last update of archived tasks.
+    :param batch_size: maximal number of moved tasks.
+    :return: insert statement.
+    """
+    expired = (
+        select(Task.id, Task.user_id)
+        .where(
+            Task.status == TaskStatus.DONE,
+            Task.updated_at < func.now() - min_age,
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("expired")
+    )
+    moved = (
+        delete(Task)
+        .where(Task.id == expired.c.id, Task.user_id == expired.c.user_id)
+        .returning(*(Task.__table__.c[name] for name in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    return insert(TaskArchive).from_select(
+        ARCHIVED_COLUMNS,
+        select(*(moved.c[name] for name in ARCHIVED_COLUMNS)),
+    )
+
+
+async def archive_done_tasks(
+    new_session: Callable[[], AsyncSession],
+    min_age: timedelta,
+    batch_size: int,
+    max_batches: int,
+) -> int:
+    """
+    Moves old done tasks to the archive in small transactions.
+
+    :param new_session: factory of sessions to the database.
+    :param min_age: time since last update of archived tasks.
+    :param batch_size: tasks moved per transaction.
+    :param max_batches: maximal number of transactions.
+    :return: number of moved tasks.
+    """
+    stmt = archive_batch_stmt(min_age, batch_size)
+    moved = 0
+    for _ in range(max_batches):
+        async with new_session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        moved += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return moved
+
+
+class TaskArchiver:
+    """Periodically archives old done tasks in every task database."""
+
+    def __init__(
+        self,
+        databases: list[Callable[[], AsyncSession]],
+        interval: float,
+        min_age: timedelta,
+        batch_size: int,
+        max_batches: int,
+    ) -> None:
+        self.databases = databases
+        self.interval = interval
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts archiving in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops archiving, the current transaction is rolled back."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def run_once(self) -> int:
+        """
+        Archives tasks in every database.
+
+        :return: number of moved tasks.
+        """
+        moved = 0
+        try:
+            for new_session in self.databases:
+                moved += await archive_done_tasks(
+                    new_session,
+                    min_age=self.min_age,
+                    batch_size=self.batch_size,
+                    max_batches=self.max_batches,
+                )
+        except Exception:
+            archiver_runs.inc(result="error")
+            raise
+        finally:
+            archived_tasks.inc(moved)
+            archived_tasks_per_run.observe(moved)
+        archiver_runs.inc(result="ok")
+        return moved
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                moved = await self.run_once()
+            except Exception:
+                logger.exception("Failed to archive done tasks")
+            else:
+                logger.info("Archived %d done tasks", moved)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from functools import partial
+from typing import Callable
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from test_app.db.shards import task_shards
+from test_app.services.archiver.archiver import TaskArchiver
+from test_app.settings import settings
+
+
+def init_task_archiver(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts archiver of done tasks if it's enabled.
+
+    Tasks are archived in every task shard or in the main database.
+
+    :param app: current fastapi application.
+    """
+    app.state.task_archiver = None
+    if not settings.task_archiver_enabled:
+        return
+    databases: list[Callable[[], AsyncSession]] = (
+        [partial(task_shards.session, shard) for shard in range(len(task_shards))]
+        if task_shards.configured
+        else [app.state.db_session_factory]
+    )
+    archiver = TaskArchiver(
+        databases,
+        interval=settings.task_archiver_interval_seconds,
+        min_age=timedelta(seconds=settings.task_archiver_min_age_seconds),
+        batch_size=settings.task_archiver_batch_size,
+        max_batches=settings.task_archiver_max_batches,
+    )
+    archiver.start()
+    app.state.task_archiver = archiver
+
+
+async def shutdown_task_archiver(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops archiver of done tasks.
+
+    :param app: current FastAPI app.
+    """
+    if app.state.task_archiver is not None:
+        await app.state.task_archiver.stop()
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import HTTPException
 from fastapi.param_functions import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jwt import InvalidTokenError
 from starlette import status
 
 from test_app.db.dao import UserDAO
@@ -11,6 +12,7 @@ from test_app.utils.auth import (
     ACCESS_JWT_TYPE,
     REFRESH_JWT_TYPE,
     create_access_token,
+    decode_jwt,
 )
 
 http_bearer = HTTPBearer()
@@ -40,6 +42,29 @@ async def get_current_auth_user(
     return user
 
 
+async def get_current_auth_user_id(
+    token: str = Depends(get_bearer_token),
+) -> int:
+    """
+    Getting current authenticated user id by access token.
+
+    Unlike get_current_auth_user it doesn't touch the database,
+    so it suits long-lived connections.
+    """
+    try:
+        match decode_jwt(token):
+            case {"sub": int() as user_id, "type": token_type} if (
+                token_type == ACCESS_JWT_TYPE
+            ):
+                return user_id
+    except InvalidTokenError:
+        pass
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="UNAUTHORIZED",
+    )
+
+
 async def get_current_auth_user_by_refresh_token(
     user_dao: Annotated[UserDAO, Depends()],
     token: str = Depends(get_bearer_token),
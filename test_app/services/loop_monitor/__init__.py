@@ -0,0 +1 @@
+"""Event loop lag monitor."""
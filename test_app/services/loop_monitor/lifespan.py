@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+
+from test_app.services.loop_monitor.monitor import LoopLagMonitor
+from test_app.settings import settings
+
+
+def init_loop_monitor(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts event loop lag monitor if it's enabled.
+
+    :param app: current fastapi application.
+    """
+    app.state.loop_monitor = None
+    if not settings.loop_monitor_enabled:
+        return
+    monitor = LoopLagMonitor(
+        interval=settings.loop_monitor_interval_seconds,
+        block_threshold=settings.loop_monitor_block_threshold_seconds,
+    )
+    monitor.start()
+    app.state.loop_monitor = monitor
+
+
+async def shutdown_loop_monitor(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops event loop lag monitor.
+
+    :param app: current FastAPI app.
+    """
+    if app.state.loop_monitor is not None:
+        await app.state.loop_monitor.stop()
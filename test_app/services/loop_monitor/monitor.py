@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import suppress
+
+from test_app.services.metrics.registry import metrics
+
+logger = logging.getLogger(__name__)
+
+loop_lag_seconds = metrics.histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake up of the monitor coroutine.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+loop_blocks = metrics.counter(
+    "event_loop_blocks",
+    "Times the event loop was blocked longer than the threshold.",
+)
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling lag and reports blocking calls.
+
+    A coroutine sleeps for a fixed interval and records how late it
+    wakes up. A watchdog thread notices when the coroutine hasn't woken
+    up for longer than the threshold and logs the stack of the event
+    loop thread, which at that moment is the blocking call.
+    """
+
+    def __init__(self, interval: float, block_threshold: float) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._last_tick = time.monotonic()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            name="loop-lag-watchdog",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Starts measuring, it must be called from the event loop thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.create_task(self._measure())
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stops measuring."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._watchdog.join()
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - started - self.interval, 0.0)
+            loop_lag_seconds.observe(lag)
+            self._last_tick = time.monotonic()
+
+    def _watch(self) -> None:
+        reported_tick = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            last_tick = self._last_tick
+            blocked_for = time.monotonic() - last_tick - self.interval
+            if blocked_for < self.block_threshold or reported_tick == last_tick:
+                continue
+            # Report every stall once, while it's still going on.
+            reported_tick = last_tick
+            frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+            if frame is None:
+                continue
+            loop_blocks.inc()
+            logger.warning(
+                "Event loop is blocked for %.3fs, blocking call:\n%s",
+                blocked_for,
+                "".join(traceback.format_stack(frame)),
+            )
@@ -0,0 +1 @@
+"""In-process metrics in Prometheus text format."""
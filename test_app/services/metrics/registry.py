@@ -0,0 +1,226 @@
+import bisect
+import math
+import threading
+from typing import Sequence
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{0}="{1}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+class Metric:
+    """Base for metrics with optional labels."""
+
+    type_name = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}",
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Returns (name suffix, label values, value) triples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Renders metric in Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, label_values, value in self.samples():
+            names = self.labelnames
+            if suffix == "_bucket":
+                names = (*names, "le")
+            labels = _format_labels(names, label_values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increases counter."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for given labels."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Returns counter samples."""
+        return [("_total", key, value) for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Sets gauge value."""
+        self._values[self._label_values(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increases gauge value."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decreases gauge value."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """Current value for given labels."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Returns gauge samples."""
+        return [("", key, value) for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Records single observation."""
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for given labels."""
+        return sum(self._counts.get(self._label_values(labels), ()))
+
+    def samples(self) -> list[tuple[str, LabelValues, float]]:
+        """Returns cumulative buckets, sum and count samples."""
+        samples: list[tuple[str, LabelValues, float]] = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", (*key, _format_value(bound)), cumulative))
+            samples.append(("_sum", key, self._sums[key]))
+            samples.append(("_count", key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Keeps metrics of current worker."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> Counter:
+        """Gets or creates counter."""
+        metric = self._register(Counter(name, description, labelnames))
+        assert isinstance(metric, Counter)  # noqa: S101
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        """Gets or creates gauge."""
+        metric = self._register(Gauge(name, description, labelnames))
+        assert isinstance(metric, Gauge)  # noqa: S101
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Gets or creates histogram."""
+        metric = self._register(Histogram(name, description, labelnames, buckets))
+        assert isinstance(metric, Histogram)  # noqa: S101
+        return metric
+
+    def render(self) -> str:
+        """Renders all metrics in Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1 @@
+"""Sampling profiler for requests."""
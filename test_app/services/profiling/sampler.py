@@ -0,0 +1,108 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+Frame = tuple[str, str, int]
+
+
+class StackSampler:
+    """
+    Samples call stack of a thread from a helper thread.
+
+    It's meant for the event loop thread, so samples taken
+    while a request awaits I/O show whatever else the loop runs
+    at that moment, including other requests or the idle selector.
+    """
+
+    def __init__(self, interval: float, thread_id: int | None = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: list[tuple[Frame, ...]] = []
+        self.weights: list[float] = []
+        self.started = 0.0
+        self.duration = 0.0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Starts sampling."""
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sampling and waits for the sampling thread."""
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        previous = self.started
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            now = time.perf_counter()
+            if frame is None:
+                return
+            self.samples.append(_collect_stack(frame))
+            self.weights.append(now - previous)
+            previous = now
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """
+        Converts samples into speedscope file format.
+
+        See https://www.speedscope.app/file-format-schema.json.
+
+        :param name: name of the profile.
+        :return: speedscope document.
+        """
+        frames: dict[Frame, int] = {}
+        samples = [
+            [frames.setdefault(frame, len(frames)) for frame in stack]
+            for stack in self.samples
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "test_app",
+            "shared": {
+                "frames": [
+                    {"name": function, "file": file, "line": line}
+                    for function, file, line in frames
+                ],
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": self.weights,
+                },
+            ],
+        }
+
+    def dump(self, path: Path, name: str) -> None:
+        """
+        Writes speedscope profile to file.
+
+        :param path: file path.
+        :param name: name of the profile.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_speedscope(name)))
+
+
+def _collect_stack(frame: FrameType | None) -> tuple[Frame, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, frame.f_lineno))
+        frame = frame.f_back
+    # Speedscope expects stacks ordered from root to leaf.
+    return tuple(reversed(stack))
@@ -0,0 +1 @@
+"""Readiness checks of service dependencies."""
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+
+from test_app.settings import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+CheckResult = dict[str, Any]
+
+STATUS_OK = "ok"
+STATUS_FAIL = "fail"
+
+
+async def _timed(check: Callable[[], Awaitable[str | None]]) -> CheckResult:
+    """
+    Runs single check with a timeout and measures its latency.
+
+    A check fails by raising or returning a failure description.
+    """
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(
+            check(),
+            timeout=settings.readiness_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        detail = "timeout"
+    except Exception as error:
+        detail = f"{type(error).__name__}: {error}"
+    result: CheckResult = {
+        "status": STATUS_OK if detail is None else STATUS_FAIL,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if detail is not None:
+        result["detail"] = detail
+    return result
+
+
+async def check_database(engine: "AsyncEngine") -> CheckResult:
+    """Runs SELECT 1 on a pooled connection."""
+
+    async def select_one() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    return await _timed(select_one)
+
+
+async def check_redis(redis_pool: "ConnectionPool") -> CheckResult:
+    """Sends PING to redis."""
+
+    async def ping() -> None:
+        async with Redis(connection_pool=redis_pool) as redis:
+            await redis.ping()
+
+    return await _timed(ping)
+
+
+def _headroom(available: int) -> CheckResult:
+    if available < settings.readiness_min_pool_headroom:
+        return {"status": STATUS_FAIL, "available": available}
+    return {"status": STATUS_OK, "available": available}
+
+
+def check_db_pool(engine: "AsyncEngine") -> CheckResult:
+    """Checks there are free connections in the database pool."""
+    pool: Any = engine.pool
+    capacity = pool.size() + pool._max_overflow  # noqa: SLF001
+    return _headroom(capacity - pool.checkedout())
+
+
+def check_redis_pool(redis_pool: "ConnectionPool") -> CheckResult:
+    """Checks there are free connections in the redis pool."""
+    in_use = len(redis_pool._in_use_connections)  # noqa: SLF001
+    return _headroom(redis_pool.max_connections - in_use)
+
+
+class ReadinessChecker:
+    """
+    Checks service dependencies and caches the outcome for a short time.
+
+    Concurrent probes share a single in-flight check,
+    so frequent probing adds no load on the dependencies.
+    """
+
+    def __init__(self) -> None:
+        self._result: dict[str, CheckResult] | None = None
+        self._checked_at = 0.0
+        self._pending: asyncio.Future[dict[str, CheckResult]] | None = None
+
+    def _cached(self) -> dict[str, CheckResult] | None:
+        age = time.monotonic() - self._checked_at
+        if self._result is not None and age < settings.readiness_cache_ttl_seconds:
+            return self._result
+        return None
+
+    async def check(
+        self,
+        engine: "AsyncEngine",
+        redis_pool: "ConnectionPool",
+    ) -> dict[str, CheckResult]:
+        """
+        Returns results of all checks.
+
+        :param engine: database engine.
+        :param redis_pool: redis connection pool.
+        :return: check results by name.
+        """
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        if self._pending is not None:
+            return await asyncio.shield(self._pending)
+
+        self._pending = asyncio.get_running_loop().create_future()
+        try:
+            database, redis = await asyncio.gather(
+                check_database(engine),
+                check_redis(redis_pool),
+            )
+            result = {
+                "database": database,
+                "redis": redis,
+                "database_pool": check_db_pool(engine),
+                "redis_pool": check_redis_pool(redis_pool),
+            }
+        except BaseException:
+            self._pending.cancel()
+            raise
+        else:
+            self._pending.set_result(result)
+        finally:
+            self._pending = None
+        self._result, self._checked_at = result, time.monotonic()
+        return result
+
+
+readiness_checker = ReadinessChecker()
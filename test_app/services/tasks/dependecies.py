@@ -1,24 +1,39 @@
-from typing import Annotated
+from typing import AsyncGenerator
 
-from fastapi import Depends, HTTPException
-from fastapi.params import Path
-from starlette import status
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
 
-from test_app.db.dao.task import TaskDAO
-from test_app.db.models.tasks import Task
+from test_app.db.dependencies import get_db_session
 from test_app.db.models.users import User
+from test_app.db.shards import task_shards
 from test_app.services.auth import get_current_auth_user
+from test_app.services.tasks.events import TaskEventHub
 
 
-async def get_task_by_id(
-    task_dao: Annotated[TaskDAO, Depends()],
-    id: Annotated[int, Path],
+async def get_task_event_hub(request: Request) -> TaskEventHub:  # pragma: no cover
+    """Returns task events hub of current worker."""
+    return request.app.state.task_event_hub
+
+
+async def get_task_session(
     user: User = Depends(get_current_auth_user),
-) -> Task:
-    """Gets user's task (if exists) by id from url path or rais 403 http exception."""
-    task = await task_dao.get_task_by_id(task_id=id)
-    if task and task.user_id == user.id:
-        return task
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-    )
+    session: AsyncSession = Depends(get_db_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create and get session to the database holding user's tasks.
+
+    :param user: current user.
+    :param session: session to the main database.
+    :yield: session to user's task shard or the main database session.
+    """
+    if not task_shards.configured:
+        yield session
+        return
+
+    shard_session = task_shards.session(task_shards.shard_for(user))
+    try:
+        yield shard_session
+    finally:
+        await shard_session.commit()
+        await shard_session.close()
@@ -0,0 +1,277 @@
+import asyncio
+import enum
+import json
+import logging
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from test_app.settings import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool
+    from redis.asyncio.client import PubSub
+
+logger = logging.getLogger(__name__)
+
+TASK_EVENTS_PREFIX = "task_events"
+
+
+class TaskEventType(str, enum.Enum):
+    """Kinds of task changes pushed to clients."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass
+class TaskEvent:
+    """Single task change with its redis stream id."""
+
+    id: str
+    data: str
+
+
+@dataclass(eq=False)
+class TaskEventSubscription:
+    """Per-connection queue of live task events."""
+
+    queue: "asyncio.Queue[TaskEvent]" = field(
+        default_factory=lambda: asyncio.Queue(
+            maxsize=settings.task_events_queue_size,
+        ),
+    )
+    # Set when the client couldn't keep up and events were dropped.
+    lagged: bool = False
+
+
+def task_events_key(user_id: int) -> str:
+    """Name of user's pub/sub channel and replay stream."""
+    return f"{TASK_EVENTS_PREFIX}:user_{user_id}"
+
+
+def parse_stream_id(stream_id: str) -> tuple[int, int]:
+    """Converts redis stream id into comparable tuple."""
+    milliseconds, _, sequence = stream_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def is_valid_stream_id(stream_id: str) -> bool:
+    """Checks that Last-Event-ID header holds redis stream id."""
+    try:
+        parse_stream_id(stream_id)
+    except ValueError:
+        return False
+    return True
+
+
+async def publish_task_event(
+    redis_pool: "ConnectionPool",
+    user_id: int,
+    event_type: TaskEventType,
+    task_id: int,
+    changes: dict[str, Any] | None = None,
+) -> None:
+    """
+    Appends task change to user's replay stream and notifies live listeners.
+
+    :param redis_pool: redis connection pool.
+    :param user_id: owner of the task.
+    :param event_type: kind of change.
+    :param task_id: id of changed task.
+    :param changes: changed fields of the task.
+    """
+    key = task_events_key(user_id)
+    payload: dict[str, Any] = {"type": event_type.value, "id": task_id}
+    if changes:
+        payload["changes"] = changes
+    data = json.dumps(payload, separators=(",", ":"), default=str)
+
+    async with Redis(connection_pool=redis_pool) as redis:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                key,
+                {"data": data},
+                maxlen=settings.task_events_stream_maxlen,
+                approximate=True,
+            )
+            pipe.expire(key, settings.task_events_stream_ttl_seconds)
+            stream_id, _ = await pipe.execute()
+        message = json.dumps({"id": _decode(stream_id), "data": data})
+        await redis.publish(key, message)
+
+
+async def read_missed_task_events(
+    redis_pool: "ConnectionPool",
+    user_id: int,
+    last_event_id: str,
+) -> list[TaskEvent] | None:
+    """
+    Reads events published after last_event_id from user's replay stream.
+
+    :param redis_pool: redis connection pool.
+    :param user_id: owner of the stream.
+    :param last_event_id: id of the last event client received.
+    :return: missed events or None if some of them were already trimmed.
+    """
+    key = task_events_key(user_id)
+    async with Redis(connection_pool=redis_pool) as redis:
+        oldest = await redis.xrange(key, count=1)
+        if oldest and parse_stream_id(_decode(oldest[0][0])) > parse_stream_id(
+            last_event_id,
+        ):
+            return None
+        entries = await redis.xrange(
+            key,
+            min=f"({last_event_id}",
+            count=settings.task_events_stream_maxlen,
+        )
+    return [
+        TaskEvent(id=_decode(entry_id), data=_decode(fields[b"data"]))
+        for entry_id, fields in entries
+    ]
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class TaskEventHub:
+    """
+    Fans out task events from redis to connections of current worker.
+
+    The hub holds a single pub/sub connection per worker and subscribes
+    to a user's channel only while that user has open event streams,
+    so idle connections cost a queue, not a redis connection.
+    """
+
+    def __init__(self, redis_pool: "ConnectionPool") -> None:
+        self._pubsub: "PubSub" = Redis(connection_pool=redis_pool).pubsub(
+            ignore_subscribe_messages=True,
+        )
+        self._subscriptions: dict[str, set[TaskEventSubscription]] = {}
+        self._connected = asyncio.Event()
+        self._listener: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts background listener."""
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stops background listener and closes pub/sub connection."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+        await self._pubsub.aclose()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[TaskEventSubscription]:
+        """
+        Subscribes connection to user's task events.
+
+        :param user_id: owner of the tasks.
+        :yield: subscription receiving live events.
+        """
+        channel = task_events_key(user_id)
+        subscription = TaskEventSubscription()
+        subscriptions = self._subscriptions.setdefault(channel, set())
+        subscriptions.add(subscription)
+        try:
+            if len(subscriptions) == 1:
+                await self._pubsub.subscribe(channel)
+                self._connected.set()
+            yield subscription
+        finally:
+            subscriptions.discard(subscription)
+            if not subscriptions and self._subscriptions.get(channel) is subscriptions:
+                del self._subscriptions[channel]
+                with suppress(RedisError):
+                    await self._pubsub.unsubscribe(channel)
+
+    def dispatch(self, channel: str, message: str) -> None:
+        """Puts message into queues of channel's subscribers."""
+        event = TaskEvent(**json.loads(message))
+        for subscription in self._subscriptions.get(channel, ()):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.lagged = True
+
+    async def _listen(self) -> None:
+        await self._connected.wait()
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+            except RedisError:
+                logger.exception("Task events listener lost redis connection")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            self.dispatch(_decode(message["channel"]), _decode(message["data"]))
+
+
+def format_sse(data: str, event_id: str | None = None, event: str | None = None) -> str:
+    """Formats single server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_task_events(
+    hub: TaskEventHub,
+    redis_pool: "ConnectionPool",
+    user_id: int,
+    last_event_id: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Yields server-sent events with user's task changes.
+
+    Missed events are replayed from the redis stream when client
+    reconnects with Last-Event-ID. If they were already trimmed,
+    the client gets a "reset" event and should reload the task list.
+
+    :param hub: task events hub of current worker.
+    :param redis_pool: redis connection pool.
+    :param user_id: owner of the tasks.
+    :param last_event_id: id of the last event client received.
+    :yield: encoded server-sent events.
+    """
+    yield f"retry: {settings.task_events_retry_ms}\n\n"
+    async with hub.subscribe(user_id) as subscription:
+        last_seen = None
+        if last_event_id is not None and is_valid_stream_id(last_event_id):
+            last_seen = parse_stream_id(last_event_id)
+            missed = await read_missed_task_events(redis_pool, user_id, last_event_id)
+            if missed is None:
+                yield format_sse("{}", event="reset")
+                missed = []
+            for event in missed:
+                last_seen = parse_stream_id(event.id)
+                yield format_sse(event.data, event_id=event.id)
+
+        while not subscription.lagged:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=settings.task_events_heartbeat_seconds,
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            # Live events may overlap with replayed ones.
+            if last_seen is not None and parse_stream_id(event.id) <= last_seen:
+                continue
+            yield format_sse(event.data, event_id=event.id)
@@ -0,0 +1,23 @@
+from fastapi import FastAPI
+
+from test_app.services.tasks.events import TaskEventHub
+
+
+def init_task_events(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts task events hub of current worker.
+
+    :param app: current fastapi application.
+    """
+    hub = TaskEventHub(app.state.redis_pool)
+    hub.start()
+    app.state.task_event_hub = hub
+
+
+async def shutdown_task_events(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops task events hub.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.task_event_hub.stop()
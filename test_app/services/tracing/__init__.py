@@ -0,0 +1 @@
+"""Distributed tracing compatible with OpenTelemetry."""
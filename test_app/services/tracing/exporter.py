@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import urllib.request
+from collections import deque
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Protocol, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from test_app.services.tracing.tracer import Span
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "test_app"
+
+
+class SpanExporter(Protocol):
+    """Sends batches of finished spans somewhere."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Exports spans, it's called from a worker thread."""
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+    ]
+
+
+def encode_spans(spans: Sequence[Span]) -> dict[str, Any]:
+    """
+    Encodes spans as OTLP-JSON traces export request.
+
+    :param spans: finished spans.
+    :return: request body accepted by OTLP/HTTP collectors.
+    """
+    encoded = []
+    for span in spans:
+        item: dict[str, Any] = {
+            "traceId": span.context.trace_id,
+            "spanId": span.context.span_id,
+            "name": span.name,
+            "kind": int(span.kind),
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns),
+            "attributes": _attributes(span.attributes),
+            "status": {"code": int(span.status)},
+        }
+        if span.parent_span_id:
+            item["parentSpanId"] = span.parent_span_id
+        if span.status_message:
+            item["status"]["message"] = span.status_message
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _attributes({"service.name": SERVICE_NAME}),
+                },
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": encoded}],
+            },
+        ],
+    }
+
+
+class FileSpanExporter:
+    """Appends each batch as an OTLP-JSON line to a local file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Writes spans to the file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as file:
+            file.write(json.dumps(encode_spans(spans)) + "\n")
+
+
+class OTLPHTTPSpanExporter:
+    """Posts batches to OTLP/HTTP collector in JSON encoding."""
+
+    def __init__(self, endpoint: str, timeout: float = 10.0) -> None:
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Sends spans to the collector."""
+        request = urllib.request.Request(  # noqa: S310
+            self.endpoint,
+            data=json.dumps(encode_spans(spans)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):  # noqa: S310
+            pass
+
+
+class BatchSpanProcessor:
+    """
+    Buffers finished spans and exports them in batches in the background.
+
+    Spans are dropped when the buffer is full,
+    so a stuck exporter never slows requests down.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 8192,
+        max_batch_size: int = 512,
+        export_interval: float = 5.0,
+    ) -> None:
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.export_interval = export_interval
+        self.dropped_spans = 0
+        self._queue: deque[Span] = deque()
+        self._max_queue_size = max_queue_size
+        self._worker: asyncio.Task[None] | None = None
+
+    def on_end(self, span: Span) -> None:
+        """Queues finished span."""
+        if len(self._queue) >= self._max_queue_size:
+            self.dropped_spans += 1
+            return
+        self._queue.append(span)
+
+    def start(self) -> None:
+        """Starts background export."""
+        self._worker = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        """Stops background export and exports remaining spans."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+        await self.force_flush()
+
+    async def force_flush(self) -> None:
+        """Exports all queued spans."""
+        while self._queue:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.max_batch_size, len(self._queue)))
+            ]
+            try:
+                await run_in_threadpool(self.exporter.export, batch)
+            except Exception:
+                logger.exception("Failed to export %d spans", len(batch))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.export_interval)
+            await self.force_flush()
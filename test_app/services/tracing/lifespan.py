@@ -0,0 +1,46 @@
+from fastapi import FastAPI
+
+from test_app.services.tracing.exporter import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPHTTPSpanExporter,
+    SpanExporter,
+)
+from test_app.services.tracing.tracer import tracer
+from test_app.settings import settings
+
+
+def init_tracing(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts batched span export if tracing is enabled.
+
+    :param app: current fastapi application.
+    """
+    if not settings.tracing_enabled:
+        return
+    exporter: SpanExporter
+    if settings.tracing_otlp_endpoint:
+        exporter = OTLPHTTPSpanExporter(settings.tracing_otlp_endpoint)
+    else:
+        exporter = FileSpanExporter(settings.tracing_export_path)
+    processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.tracing_max_queue_size,
+        max_batch_size=settings.tracing_max_batch_size,
+        export_interval=settings.tracing_export_interval_seconds,
+    )
+    processor.start()
+    tracer.processor = processor
+
+
+async def shutdown_tracing(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Exports remaining spans.
+
+    :param app: current FastAPI app.
+    """
+    processor = tracer.processor
+    if processor is None:
+        return
+    tracer.processor = None
+    await processor.shutdown()
@@ -0,0 +1,182 @@
+import enum
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator
+
+from test_app.settings import settings
+
+if TYPE_CHECKING:
+    from test_app.services.tracing.exporter import BatchSpanProcessor
+
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT_RE = re.compile(
+    r"^00-(?P<trace_id>[0-9a-f]{32})-(?P<span_id>[0-9a-f]{16})"
+    r"-(?P<flags>[0-9a-f]{2})$",
+)
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanKind(enum.IntEnum):
+    """OTLP span kinds."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class StatusCode(enum.IntEnum):
+    """OTLP span status codes."""
+
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+@dataclass
+class SpanContext:
+    """Identifies a span inside a trace."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+@dataclass
+class Span:
+    """Single timed operation of a trace."""
+
+    name: str
+    context: SpanContext
+    parent_span_id: str | None = None
+    kind: SpanKind = SpanKind.INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    status: StatusCode = StatusCode.UNSET
+    status_message: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Sets span attribute."""
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        """Marks span as failed."""
+        self.status = StatusCode.ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: str | None) -> SpanContext | None:
+    """
+    Parses W3C traceparent header.
+
+    :param header: header value.
+    :return: remote span context or None for missing or invalid header.
+    """
+    if header is None:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id = match["trace_id"], match["span_id"]
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(
+        trace_id=trace_id,
+        span_id=span_id,
+        sampled=bool(int(match["flags"], 16) & 1),
+    )
+
+
+def format_traceparent(context: SpanContext) -> str:
+    """Formats span context as W3C traceparent header."""
+    flags = "01" if context.sampled else "00"
+    return f"00-{context.trace_id}-{context.span_id}-{flags}"
+
+
+def get_current_span() -> Span | None:
+    """Returns span of current context."""
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the span processor.
+
+    While there is no processor, spans are not created at all,
+    so disabled tracing costs a context variable lookup.
+    """
+
+    def __init__(self) -> None:
+        self.processor: "BatchSpanProcessor | None" = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self.processor is not None
+
+    def _should_sample(self, trace_id: str) -> bool:
+        # Same as OpenTelemetry TraceIdRatioBased sampler.
+        ratio = settings.tracing_sample_ratio
+        return int(trace_id[16:], 16) < ratio * 2**64
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+        parent: SpanContext | None = None,
+    ) -> Iterator[Span | None]:
+        """
+        Starts span as a child of current or given remote parent.
+
+        :param name: span name.
+        :param kind: span kind.
+        :param attributes: initial span attributes.
+        :param parent: remote parent context, e.g. from traceparent.
+        :yield: started span or None if tracing is disabled.
+        """
+        processor = self.processor
+        if processor is None:
+            yield None
+            return
+
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is None:
+            trace_id = secrets.token_hex(16)
+            sampled = self._should_sample(trace_id)
+        else:
+            trace_id, sampled = parent.trace_id, parent.sampled
+        context = SpanContext(trace_id, secrets.token_hex(8), sampled)
+
+        span = Span(
+            name=name,
+            context=context,
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            attributes=attributes or {},
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.set_error(error)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time_ns = time.time_ns()
+            if context.sampled:
+                processor.on_end(span)
+
+
+tracer = Tracer()
@@ -0,0 +1 @@
+"""Startup warm-up of connection pools."""
@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import suppress
+
+from fastapi import FastAPI
+
+from test_app.services.warmup.warmup import warm_up
+from test_app.settings import settings
+
+
+def init_warmup(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts warm-up in the background.
+
+    Startup isn't blocked, so the readiness endpoint can
+    report that the worker is still warming up.
+
+    :param app: current fastapi application.
+    """
+    app.state.warmup = asyncio.create_task(
+        warm_up(
+            app,
+            db_connections=settings.warmup_db_connections,
+            redis_connections=settings.warmup_redis_connections,
+        ),
+    )
+
+
+async def shutdown_warmup(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Cancels unfinished warm-up.
+
+    :param app: current FastAPI app.
+    """
+    app.state.warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.warmup
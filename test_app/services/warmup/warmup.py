@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from test_app.db.dao.task import TaskDAO
+from test_app.db.dao.user import UserDAO
+from test_app.db.loaders import users_by_ids_stmt
+from test_app.utils.task_status import TaskStatus
+
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+async def _prime_statements(connection: AsyncConnection) -> None:
+    """
+    Runs DAO read queries on the connection.
+
+    asyncpg keeps prepared statements per connection,
+    so later requests skip the prepare round trip.
+    """
+    async with AsyncSession(bind=connection) as session:
+        user_dao = UserDAO(session)
+        await user_dao.get_user_by_id(0)
+        await session.scalars(users_by_ids_stmt([0]))
+        await user_dao.get_user_by_username("")
+        task_dao = TaskDAO(session)
+        await task_dao.get_task_by_id(0)
+        await task_dao.get_all_tasks(status=None)
+        await task_dao.get_all_tasks(status=TaskStatus.TODO)
+        await session.rollback()
+
+
+async def warm_up_db(engine: AsyncEngine, connections_count: int) -> None:
+    """
+    Opens pool connections at once and primes them.
+
+    :param engine: application engine.
+    :param connections_count: number of connections to open.
+    """
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections_count)),
+        return_exceptions=True,
+    )
+    connections = [conn for conn in results if isinstance(conn, AsyncConnection)]
+    try:
+        for connection in connections:
+            await _prime_statements(connection)
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def warm_up_redis(redis_pool: "ConnectionPool", connections_count: int) -> None:
+    """
+    Opens redis pool connections at once.
+
+    :param redis_pool: application redis pool.
+    :param connections_count: number of connections to open.
+    """
+    results = await asyncio.gather(
+        *(redis_pool.get_connection("PING") for _ in range(connections_count)),
+        return_exceptions=True,
+    )
+    connections = [conn for conn in results if not isinstance(conn, BaseException)]
+    try:
+        for connection in connections:
+            await connection.send_command("PING")
+            await connection.read_response()
+    finally:
+        for connection in connections:
+            await redis_pool.release(connection)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def warm_up(
+    app: FastAPI,
+    db_connections: int,
+    redis_connections: int,
+) -> None:
+    """
+    Warms up pools and caches of the application.
+
+    Failures are logged only, the worker is usable without warm-up.
+
+    :param app: current application.
+    :param db_connections: number of database connections to open.
+    :param redis_connections: number of redis connections to open.
+    """
+    results = await asyncio.gather(
+        warm_up_db(app.state.db_engine, db_connections),
+        warm_up_redis(app.state.redis_pool, redis_connections),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("Warm-up failed", exc_info=result)
+    # Builds and caches OpenAPI schema for the docs.
+    app.openapi()
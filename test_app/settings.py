@@ -53,6 +53,8 @@ class Settings(BaseSettings):
 
     # Auth JWT variables
     auth_jwt: AuthJWT = AuthJWT()
+    # Bcrypt work factor, stored hashes with another one are updated on login
+    bcrypt_rounds: int = 12
 
     # Variables for the database
     db_host: str = "localhost"
@@ -61,6 +63,19 @@ class Settings(BaseSettings):
     db_pass: str = "test_app"
     db_base: str = "admin"
     db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Databases for tasks sharded by user, tasks are stored
+    # in the main database when it's empty
+    db_task_shard_urls: list[str] = []
+    # Hash partitions of the task table, used by migrations
+    db_task_partitions: int = 16
+
+    # Users requested by concurrent requests within the window
+    # are loaded with one query, zero window means one loop tick
+    user_loader_enabled: bool = True
+    user_loader_batch_size: int = 100
+    user_loader_window_seconds: float = 0.0
 
     naming_conventions: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -77,6 +92,71 @@ class Settings(BaseSettings):
     redis_pass: Optional[str] = None
     redis_base: Optional[int] = None
 
+    # Per-request sampling profiler, off by default.
+    profiling_enabled: bool = False
+    # Requests carrying this header with the secret value are profiled
+    profiling_header: str = "X-Profile"
+    profiling_secret: Optional[str] = None
+    # Share of all requests profiled at random, from 0 to 1
+    profiling_sample_rate: float = 0.0
+    profiling_interval_seconds: float = 0.001
+    profiling_dir: Path = TEMP_DIR / "test_app_profiles"
+
+    # Distributed tracing, off by default.
+    tracing_enabled: bool = False
+    # Share of new traces recorded, incoming traceparent flags take precedence
+    tracing_sample_ratio: float = 1.0
+    # Spans are appended as OTLP-JSON lines unless collector endpoint is set,
+    # e.g. http://otel-collector:4318/v1/traces
+    tracing_export_path: Path = TEMP_DIR / "test_app_traces.jsonl"
+    tracing_otlp_endpoint: Optional[str] = None
+    tracing_export_interval_seconds: float = 5.0
+    tracing_max_batch_size: int = 512
+    tracing_max_queue_size: int = 8192
+
+    # Connections opened at startup before the worker reports readiness
+    warmup_db_connections: int = 5
+    warmup_redis_connections: int = 5
+
+    # Readiness probe, dependency checks are cached to keep probes cheap
+    readiness_timeout_seconds: float = 1.0
+    readiness_cache_ttl_seconds: float = 2.0
+    # Free pool connections below this make the worker not ready
+    readiness_min_pool_headroom: int = 1
+
+    # Event loop lag monitor
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    # Blocking longer than this is logged with the stack of the blocking call
+    loop_monitor_block_threshold_seconds: float = 0.25
+
+    # Server-sent task events
+    task_events_heartbeat_seconds: float = 15.0
+    # Client reconnection delay advertised in the event stream
+    task_events_retry_ms: int = 3000
+    # Approximate length of per-user replay stream in redis
+    task_events_stream_maxlen: int = 1000
+    task_events_stream_ttl_seconds: int = 24 * 60 * 60
+    # Undelivered events kept per connection before it's dropped
+    task_events_queue_size: int = 100
+
+    # Archiver moving old done tasks out of the task table
+    task_archiver_enabled: bool = True
+    task_archiver_interval_seconds: float = 300.0
+    # Done tasks not updated for this long are archived
+    task_archiver_min_age_seconds: int = 30 * 24 * 60 * 60
+    # Rows moved per transaction and transactions per run
+    task_archiver_batch_size: int = 500
+    task_archiver_max_batches: int = 100
+
+    # Gzip or brotli compression of text responses
+    compression_enabled: bool = True
+    # Bodies smaller than this are sent as is, streaming bodies are always compressed
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    # Brotli is used only when the brotli package is installed
+    compression_brotli_quality: int = 4
+
     @property
     def db_url(self) -> URL:
         """
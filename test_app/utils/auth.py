@@ -3,6 +3,7 @@ from typing import Any
 
 import jwt
 
+from test_app.services.tracing.tracer import tracer
 from test_app.settings import settings
 
 JWT_TYPE_FIELD = "type"
@@ -16,11 +17,12 @@ def encode_jwt(
     algorithm: str = settings.auth_jwt.algorithm,
 ) -> str:
     """Creates jwt token."""
-    return jwt.encode(
-        payload,
-        key,
-        algorithm,
-    )
+    with tracer.start_span("jwt.encode"):
+        return jwt.encode(
+            payload,
+            key,
+            algorithm,
+        )
 
 
 def decode_jwt(
@@ -29,11 +31,12 @@ def decode_jwt(
     algorithm: str = settings.auth_jwt.algorithm,
 ) -> dict[str, Any]:
     """Decodes jwt token."""
-    return jwt.decode(
-        token,
-        key,
-        algorithms=[algorithm],
-    )
+    with tracer.start_span("jwt.decode"):
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+        )
 
 
 def create_jwt(token_type: str, payload: dict[str, Any]) -> str:
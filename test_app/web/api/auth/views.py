@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Form, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Form, HTTPException, status
 from fastapi.param_functions import Depends
 
 from test_app.db.dao import UserDAO
@@ -62,6 +62,7 @@ async def login_user(
     username: Annotated[str, Form()],
     password: Annotated[str, Form()],
     user_dao: Annotated[UserDAO, Depends()],
+    background_tasks: BackgroundTasks,
 ) -> TokenInfo:
     """Authenticates user by username.Saves refresh token to redis."""
     user = await user_dao.authenticate(username, password)
@@ -70,6 +71,8 @@ async def login_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="LOGIN_BAD_CREDENTIALS",
         )
+    if user_dao.password_needs_rehash(user):
+        background_tasks.add_task(user_dao.rehash_password, user.id, password)
     access_token = create_access_token({"sub": user.id, "username": user.username})
     refresh_token = create_refresh_token({"sub": user.id})
     await user_dao.save_refresh_token_to_redis(user=user, token=refresh_token)
@@ -1,4 +1,14 @@
-from fastapi import APIRouter
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import PlainTextResponse
+from redis.asyncio import ConnectionPool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from test_app.db.dependencies import get_db_engine
+from test_app.services.metrics.registry import metrics
+from test_app.services.readiness.checks import STATUS_OK, readiness_checker
+from test_app.services.redis.dependency import get_redis_pool
 
 router = APIRouter()
 
@@ -10,3 +20,62 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get(
+    "/ready",
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "not_ready",
+                        "checks": {
+                            "database": {"status": "ok", "latency_ms": 1.2},
+                            "redis": {
+                                "status": "fail",
+                                "latency_ms": 1000.4,
+                                "detail": "timeout",
+                            },
+                            "database_pool": {"status": "ok", "available": 12},
+                            "redis_pool": {"status": "ok", "available": 50},
+                        },
+                    },
+                },
+            },
+        },
+    },
+)
+async def readiness_check(
+    request: Request,
+    response: Response,
+    engine: Annotated[AsyncEngine, Depends(get_db_engine)],
+    redis_pool: Annotated[ConnectionPool, Depends(get_redis_pool)],
+) -> dict[str, Any]:
+    """
+    Checks that the worker is ready to serve traffic.
+
+    It returns 503 until startup warm-up is finished and while
+    the database or redis don't respond or their pools are exhausted.
+    Dependency checks are cached for a short time.
+    """
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is not None and not warmup.done():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+
+    checks = await readiness_checker.check(engine, redis_pool)
+    if all(check["status"] == STATUS_OK for check in checks.values()):
+        return {"status": "ready", "checks": checks}
+    response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "not_ready", "checks": checks}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    """
+    Metrics of current worker in Prometheus text format.
+
+    :return: rendered metrics.
+    """
+    return metrics.render()
@@ -1,14 +1,23 @@
 from typing import Annotated, Sequence
 
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
 from fastapi import status as http_status
 from fastapi.param_functions import Depends
+from fastapi.responses import StreamingResponse
+from redis.asyncio import ConnectionPool
 
 from test_app.db.dao.task import TaskDAO
-from test_app.db.models.tasks import Task
+from test_app.db.models.tasks import Task, TaskArchive
 from test_app.db.models.users import User
-from test_app.services.auth import get_current_auth_user
-from test_app.services.tasks.dependecies import get_task_by_id
+from test_app.services.auth import get_current_auth_user, get_current_auth_user_id
+from test_app.services.redis.dependency import get_redis_pool
+from test_app.services.tasks.dependecies import get_task_event_hub
+from test_app.services.tasks.events import (
+    TaskEventHub,
+    TaskEventType,
+    publish_task_event,
+    stream_task_events,
+)
 from test_app.utils.task_status import TaskStatus
 from test_app.web.api.tasks.schema import TaskBase, TaskUpdatePartial
 
@@ -39,13 +48,24 @@ router = APIRouter()
 async def create_task(
     new_task_object: TaskBase,
     task_dao: Annotated[TaskDAO, Depends()],
+    background_tasks: BackgroundTasks,
+    redis_pool: Annotated[ConnectionPool, Depends(get_redis_pool)],
     user: User = Depends(get_current_auth_user),
 ) -> Task:
     """Creates task."""
-    return await task_dao.create_task_model(
+    task = await task_dao.create_task_model(
         create_task=new_task_object,
         user_id=user.id,
     )
+    background_tasks.add_task(
+        publish_task_event,
+        redis_pool,
+        user_id=user.id,
+        event_type=TaskEventType.CREATED,
+        task_id=task.id,
+        changes=new_task_object.model_dump(mode="json"),
+    )
+    return task
 
 
 @router.get(
@@ -71,10 +91,14 @@ async def create_task(
 async def get_all_tasks(
     task_dao: Annotated[TaskDAO, Depends()],
     status: TaskStatus | None = None,
+    include_archived: bool = False,
     user: User = Depends(get_current_auth_user),
-) -> Sequence[Task]:
-    """Gets all tasks with optional filter by status."""
-    return await task_dao.get_all_tasks(status=status)
+) -> Sequence[Task | TaskArchive]:
+    """Gets all tasks with optional filter by status and archived done tasks."""
+    return await task_dao.get_all_tasks(
+        status=status,
+        include_archived=include_archived,
+    )
 
 
 @router.patch(
@@ -99,16 +123,31 @@ async def get_all_tasks(
     },
 )
 async def task_update_partial(
+    id: int,
     updated_task: TaskUpdatePartial,
     task_dao: Annotated[TaskDAO, Depends()],
-    task: Task = Depends(get_task_by_id),
+    background_tasks: BackgroundTasks,
+    redis_pool: Annotated[ConnectionPool, Depends(get_redis_pool)],
+    user: User = Depends(get_current_auth_user),
 ) -> Task:
-    """Partial updates task."""
-    return await task_dao.update_task(
-        target_task=task,
+    """Partial updates user's task or raise 403 http exception."""
+    task = await task_dao.update_task(
+        task_id=id,
+        user_id=user.id,
         updated_task=updated_task,
         partial=True,
     )
+    if task is None:
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN)
+    background_tasks.add_task(
+        publish_task_event,
+        redis_pool,
+        user_id=user.id,
+        event_type=TaskEventType.UPDATED,
+        task_id=task.id,
+        changes=updated_task.model_dump(mode="json", exclude_unset=True),
+    )
+    return task
 
 
 @router.delete(
@@ -132,8 +171,58 @@ async def task_update_partial(
     },
 )
 async def delete_task(
+    id: int,
     task_dao: Annotated[TaskDAO, Depends()],
-    task: Task = Depends(get_task_by_id),
+    background_tasks: BackgroundTasks,
+    redis_pool: Annotated[ConnectionPool, Depends(get_redis_pool)],
+    user: User = Depends(get_current_auth_user),
 ) -> None:
-    """Deletes task."""
-    return await task_dao.delete_task(task=task)
+    """Deletes user's task or raise 403 http exception."""
+    if not await task_dao.delete_task(task_id=id, user_id=user.id):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN)
+    background_tasks.add_task(
+        publish_task_event,
+        redis_pool,
+        user_id=user.id,
+        event_type=TaskEventType.DELETED,
+        task_id=id,
+    )
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={
+        http_status.HTTP_200_OK: {"content": {"text/event-stream": {}}},
+        http_status.HTTP_401_UNAUTHORIZED: {
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "UNAUTHORIZED": {
+                            "summary": "Unauthorized.",
+                            "value": {
+                                "detail": "UNAUTHORIZED",
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+)
+async def task_events(
+    user_id: Annotated[int, Depends(get_current_auth_user_id)],
+    hub: Annotated[TaskEventHub, Depends(get_task_event_hub)],
+    redis_pool: Annotated[ConnectionPool, Depends(get_redis_pool)],
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """
+    Streams changes of user's tasks as server-sent events.
+
+    Reconnecting clients send Last-Event-ID to receive missed events.
+    """
+    return StreamingResponse(
+        stream_task_events(hub, redis_pool, user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,8 +5,12 @@ from fastapi import FastAPI
 from fastapi.responses import UJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from test_app.settings import settings
 from test_app.web.api.router import api_router
 from test_app.web.lifespan import lifespan_setup
+from test_app.web.middlewares.compression import CompressionMiddleware
+from test_app.web.middlewares.profiling import ProfilingMiddleware
+from test_app.web.middlewares.tracing import TracingMiddleware
 
 APP_ROOT = Path(__file__).parent.parent
 
@@ -35,4 +39,16 @@ def get_app() -> FastAPI:
     # This directory is used to access swagger files.
     app.mount("/static", StaticFiles(directory=APP_ROOT / "static"), name="static")
 
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+    if settings.tracing_enabled:
+        app.add_middleware(TracingMiddleware)
+
     return app
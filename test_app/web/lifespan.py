@@ -4,7 +4,20 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from test_app.db.loaders import user_loader
+from test_app.db.shards import task_shards
+from test_app.services.archiver.lifespan import (
+    init_task_archiver,
+    shutdown_task_archiver,
+)
+from test_app.services.loop_monitor.lifespan import (
+    init_loop_monitor,
+    shutdown_loop_monitor,
+)
 from test_app.services.redis.lifespan import init_redis, shutdown_redis
+from test_app.services.tasks.lifespan import init_task_events, shutdown_task_events
+from test_app.services.tracing.lifespan import init_tracing, shutdown_tracing
+from test_app.services.warmup.lifespan import init_warmup, shutdown_warmup
 from test_app.settings import settings
 
 
@@ -18,13 +31,31 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
 
     :param app: fastAPI application.
     """
-    engine = create_async_engine(str(settings.db_url), echo=settings.db_echo)
+    engine = create_async_engine(
+        str(settings.db_url),
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
     session_factory = async_sessionmaker(
         engine,
         expire_on_commit=False,
     )
     app.state.db_engine = engine
     app.state.db_session_factory = session_factory
+    if settings.db_task_shard_urls:
+        task_shards.configure(
+            settings.db_task_shard_urls,
+            echo=settings.db_echo,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+    if settings.user_loader_enabled:
+        user_loader.configure(
+            session_factory,
+            batch_size=settings.user_loader_batch_size,
+            window=settings.user_loader_window_seconds,
+        )
 
 
 @asynccontextmanager
@@ -42,11 +73,23 @@ async def lifespan_setup(
     """
 
     app.middleware_stack = None
+    init_tracing(app)
     _setup_db(app)
     init_redis(app)
+    init_task_events(app)
+    init_loop_monitor(app)
+    init_task_archiver(app)
     app.middleware_stack = app.build_middleware_stack()
+    init_warmup(app)
 
     yield
+    await shutdown_warmup(app)
+    await shutdown_task_archiver(app)
+    await shutdown_loop_monitor(app)
+    await shutdown_task_events(app)
+    await user_loader.close()
     await app.state.db_engine.dispose()
+    await task_shards.dispose()
 
     await shutdown_redis(app)
+    await shutdown_tracing(app)
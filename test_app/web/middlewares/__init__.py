@@ -0,0 +1 @@
+"""Pure ASGI middlewares."""
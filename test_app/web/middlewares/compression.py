@@ -0,0 +1,264 @@
+import zlib
+from typing import Optional, Protocol
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from test_app.services.metrics.registry import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Whole bodies larger than this are compressed outside of the event loop.
+THREADPOOL_MIN_SIZE = 256 * 1024
+
+COMPRESSIBLE_MEDIA_TYPES = frozenset(
+    (
+        "application/javascript",
+        "application/json",
+        "application/xml",
+        "image/svg+xml",
+    ),
+)
+# Events are small and must reach clients without delay.
+EXCLUDED_MEDIA_TYPES = frozenset(("text/event-stream",))
+
+compression_input_bytes = metrics.counter(
+    "http_compression_input_bytes",
+    "Response bytes before compression.",
+    labelnames=("encoding",),
+)
+compression_output_bytes = metrics.counter(
+    "http_compression_output_bytes",
+    "Response bytes after compression.",
+    labelnames=("encoding",),
+)
+
+
+class Compressor(Protocol):
+    """Incremental compressor of one response body."""
+
+    def flush(self, data: bytes) -> bytes:
+        """Compresses chunk so it can be decoded without following ones."""
+
+    def finish(self, data: bytes) -> bytes:
+        """Compresses last chunk and ends the stream."""
+
+
+class GzipCompressor:
+    """Gzip compressor."""
+
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def flush(self, data: bytes) -> bytes:
+        """Compresses chunk so it can be decoded without following ones."""
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        """Compresses last chunk and ends the stream."""
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class BrotliCompressor:
+    """Brotli compressor."""
+
+    def __init__(self, quality: int) -> None:
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def flush(self, data: bytes) -> bytes:
+        """Compresses chunk so it can be decoded without following ones."""
+        return self._brotli.process(data) + self._brotli.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        """Compresses last chunk and ends the stream."""
+        return self._brotli.process(data) + self._brotli.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """
+    Returns supported content encodings in order of preference.
+
+    Brotli is supported when the brotli package is installed.
+
+    :return: content encodings.
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def select_encoding(
+    accept_encoding: str,
+    encodings: tuple[str, ...],
+) -> Optional[str]:
+    """
+    Chooses content encoding accepted by the client.
+
+    :param accept_encoding: value of Accept-Encoding header.
+    :param encodings: supported encodings in order of preference.
+    :return: encoding or None if the body must be sent as is.
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(media_type: str) -> bool:
+    """
+    Checks if responses of the media type are worth compressing.
+
+    :param media_type: media type without parameters.
+    :return: True for text formats.
+    """
+    if media_type in EXCLUDED_MEDIA_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_MEDIA_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """
+    Compresses text responses with gzip or brotli.
+
+    The encoding is negotiated with Accept-Encoding, brotli is preferred.
+    Bodies sent at once are compressed when they aren't smaller
+    than the minimum size. Streaming bodies are always compressed
+    and every chunk is flushed, so clients receive it without delay.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compresses the response if the client accepts it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding", ""),
+            self.encodings,
+        )
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compressor(self, encoding: str) -> Compressor:
+        """
+        Creates compressor of one response body.
+
+        :param encoding: negotiated content encoding.
+        :return: compressor.
+        """
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: Optional[str],
+        send: Send,
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor: Optional[Compressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if self._start is not None:
+            start, self._start = self._start, None
+            if message["type"] == "http.response.body":
+                await self._send_first_body(start, message)
+                return
+            await self._send(start)
+        if self._compressor is not None and message["type"] == "http.response.body":
+            message = self._compress_chunk(message)
+        await self._send(message)
+
+    async def _send_first_body(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(scope=start)
+        if not self._eligible(start, headers):
+            await self._send(start)
+            await self._send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoding is None or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        compressor = self.middleware.compressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        if more_body:
+            del headers["Content-Length"]
+            self._compressor = compressor
+            await self._send(start)
+            await self._send(self._compress_chunk(message))
+            return
+
+        if len(body) >= THREADPOOL_MIN_SIZE:
+            compressed = await run_in_threadpool(compressor.finish, body)
+        else:
+            compressed = compressor.finish(body)
+        self._count(len(body), len(compressed))
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({**message, "body": compressed})
+
+    def _compress_chunk(self, message: Message) -> Message:
+        assert self._compressor is not None  # noqa: S101
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if more_body:
+            compressed = self._compressor.flush(body)
+        else:
+            compressed = self._compressor.finish(body)
+        self._count(len(body), len(compressed))
+        return {**message, "body": compressed}
+
+    def _eligible(self, start: Message, headers: MutableHeaders) -> bool:
+        if start["status"] in {204, 206, 304} or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0]
+        return is_compressible(media_type.strip().lower())
+
+    def _count(self, input_size: int, output_size: int) -> None:
+        assert self.encoding is not None  # noqa: S101
+        compression_input_bytes.inc(input_size, encoding=self.encoding)
+        compression_output_bytes.inc(output_size, encoding=self.encoding)
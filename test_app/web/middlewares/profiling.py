@@ -0,0 +1,65 @@
+import random
+import re
+import secrets
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from test_app.services.profiling.sampler import StackSampler
+from test_app.settings import settings
+
+
+class ProfilingMiddleware:
+    """
+    Records sampling profiles of selected requests.
+
+    A request is profiled when it carries the profiling header
+    with the configured secret, or at random with the configured rate.
+    Profiles are written in speedscope format to the profiling directory.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profiles the request if it's selected."""
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(settings.profiling_interval_seconds)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            duration_ms = round(sampler.duration * 1000)
+            filename = (
+                f"{timestamp}_{scope['method']}_{_route_slug(scope)}"
+                f"_{duration_ms}ms.speedscope.json"
+            )
+            await run_in_threadpool(
+                sampler.dump,
+                settings.profiling_dir / filename,
+                f"{scope['method']} {scope['path']}",
+            )
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if settings.profiling_secret:
+            header = Headers(scope=scope).get(settings.profiling_header)
+            if header is not None and secrets.compare_digest(
+                header,
+                settings.profiling_secret,
+            ):
+                return True
+        rate = settings.profiling_sample_rate
+        return rate > 0 and random.random() < rate  # noqa: S311
+
+
+def _route_slug(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope["path"]
+    return re.sub(r"[^A-Za-z0-9{}]+", "-", path).strip("-") or "root"
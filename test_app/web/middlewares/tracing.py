@@ -0,0 +1,58 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from test_app.services.tracing.tracer import (
+    TRACEPARENT_HEADER,
+    SpanKind,
+    StatusCode,
+    format_traceparent,
+    parse_traceparent,
+    tracer,
+)
+
+
+class TracingMiddleware:
+    """
+    Wraps each HTTP request in a server span.
+
+    The span continues the trace from incoming W3C traceparent header
+    and its own traceparent is returned in the response headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Traces the request."""
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get(TRACEPARENT_HEADER))
+        with tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+            },
+            parent=parent,
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if span is not None and message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    span.set_attribute("http.response.status_code", status_code)
+                    if status_code >= 500:
+                        span.status = StatusCode.ERROR
+                    headers = MutableHeaders(scope=message)
+                    headers[TRACEPARENT_HEADER] = format_traceparent(span.context)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if span is not None and route is not None:
+                    span.name = f"{scope['method']} {route.path}"
+                    span.set_attribute("http.route", route.path)
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from test_app.db.dependencies import get_db_session
+from test_app.db.dependencies import get_db_engine, get_db_session
 from test_app.db.models.tasks import Task
 from test_app.db.models.users import User
 from test_app.db.utils import create_database, drop_database
@@ -112,6 +112,7 @@ async def fake_redis_pool() -> AsyncGenerator[ConnectionPool, None]:
 
 @pytest.fixture
 def fastapi_app(
+    _engine: AsyncEngine,
     dbsession: AsyncSession,
     fake_redis_pool: ConnectionPool,
 ) -> FastAPI:
@@ -121,6 +122,7 @@ def fastapi_app(
     :return: fastapi app with mocked dependencies.
     """
     application = get_app()
+    application.dependency_overrides[get_db_engine] = lambda: _engine
     application.dependency_overrides[get_db_session] = lambda: dbsession
     application.dependency_overrides[get_redis_pool] = lambda: fake_redis_pool
     return application
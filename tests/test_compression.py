@@ -0,0 +1,122 @@
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+from starlette.responses import StreamingResponse
+from starlette.types import Message, Receive, Scope, Send
+
+from test_app.db.models.tasks import Task
+from test_app.db.models.users import User
+from test_app.utils.task_status import TaskStatus
+from test_app.web.middlewares.compression import CompressionMiddleware, select_encoding
+
+CHUNKS = (b'{"chunk": 1}', b'{"chunk": 2}', b'{"chunk": 3}')
+
+
+async def call_middleware(
+    middleware: CompressionMiddleware,
+    accept_encoding: bytes,
+) -> list[Message]:
+    """Requests the middleware and returns sent messages."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding)],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def streaming_app(media_type: str) -> CompressionMiddleware:
+    """Compressed app streaming chunks."""
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        response = StreamingResponse(iter(CHUNKS), media_type=media_type)
+        await response(scope, receive, send)
+
+    return CompressionMiddleware(app, minimum_size=1024)
+
+
+@pytest.mark.anyio
+async def test_large_task_list_is_compressed(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    authenticated_headers: dict,
+    user: User,
+) -> None:
+    """Tests large responses are gzipped and small ones are sent as is."""
+    dbsession.add_all(
+        Task(
+            title=f"Task {index}",
+            description="long description " * 50,
+            status=TaskStatus.TODO,
+            user_id=user.id,
+        )
+        for index in range(20)
+    )
+    await dbsession.commit()
+    headers = {**authenticated_headers["access_header"], "Accept-Encoding": "gzip"}
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_all_tasks"),
+        headers=headers,
+    )
+    health = await client.get(fastapi_app.url_path_for("health_check"), headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) >= 20
+    assert "content-encoding" not in health.headers
+
+
+@pytest.mark.anyio
+async def test_streaming_chunks_are_flushed() -> None:
+    """Tests every streamed chunk can be decoded as soon as it's received."""
+    messages = await call_middleware(
+        streaming_app("application/x-ndjson+json"),
+        b"gzip",
+    )
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoded = [decompressor.decompress(message["body"]) for message in bodies]
+    assert decoded[: len(CHUNKS)] == list(CHUNKS)
+    assert decompressor.eof
+
+
+@pytest.mark.anyio
+async def test_event_stream_is_not_compressed() -> None:
+    """Tests server-sent events are sent as is."""
+    messages = await call_middleware(streaming_app("text/event-stream"), b"gzip")
+
+    start, *bodies = messages
+    assert b"content-encoding" not in dict(start["headers"])
+    assert b"".join(message["body"] for message in bodies) == b"".join(CHUNKS)
+
+
+def test_encoding_negotiation() -> None:
+    """Tests preferred accepted encoding is chosen."""
+    encodings = ("br", "gzip")
+    assert select_encoding("gzip, deflate, br", encodings) == "br"
+    assert select_encoding("br;q=0, gzip;q=0.5", encodings) == "gzip"
+    assert select_encoding("*", ("gzip",)) == "gzip"
+    assert select_encoding("gzip;q=0", encodings) is None
+    assert select_encoding("", encodings) is None
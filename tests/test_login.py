@@ -4,7 +4,9 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from test_app.db.dao import UserDAO
 from test_app.db.models.users import User
+from test_app.settings import settings
 from tests.conftest import USER_PASSWORD
 
 
@@ -50,3 +52,27 @@ async def test_login_400(
         data={"username": username, "password": password + "wrong"},
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_login_rehashes_password_with_new_rounds(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    user: User,
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests password hash is updated after login when work factor changes."""
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    url = fastapi_app.url_path_for("login_user")
+    credentials = {"username": user.username, "password": USER_PASSWORD}
+
+    response = await client.post(url, data=credentials)
+    assert response.status_code == status.HTTP_200_OK
+
+    rehashed_user = await UserDAO(dbsession).get_user_by_username(user.username)
+    assert rehashed_user is not None
+    assert rehashed_user.hashed_password.startswith("$2b$04$")
+
+    response = await client.post(url, data=credentials)
+    assert response.status_code == status.HTTP_200_OK
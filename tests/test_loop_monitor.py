@@ -0,0 +1,48 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from test_app.services.loop_monitor.monitor import (
+    LoopLagMonitor,
+    loop_blocks,
+    loop_lag_seconds,
+)
+
+
+def block_event_loop() -> None:
+    """Blocks the loop like a synchronous call would."""
+    time.sleep(0.3)
+
+
+@pytest.mark.anyio
+async def test_blocking_call_is_reported(caplog: pytest.LogCaptureFixture) -> None:
+    """Tests monitor measures lag and logs the stack of the blocking call."""
+    monitor = LoopLagMonitor(interval=0.01, block_threshold=0.1)
+    observations = loop_lag_seconds.count()
+    blocks = loop_blocks.value()
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING):
+            block_event_loop()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert loop_lag_seconds.count() > observations
+    assert loop_blocks.value() == blocks + 1
+    assert "block_event_loop" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Tests metrics are exposed in Prometheus text format."""
+    response = await client.get(fastapi_app.url_path_for("get_metrics"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "# TYPE event_loop_lag_seconds histogram" in response.text
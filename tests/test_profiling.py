@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from starlette import status
+
+from test_app.settings import settings
+from test_app.web.application import get_app
+
+
+@pytest.fixture
+def profiling_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Enables profiling with a secret header."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_secret", "Sekret")
+    monkeypatch.setattr(settings, "profiling_dir", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_profile_written_for_secret_header(profiling_dir: Path) -> None:
+    """Tests requests with the secret header are profiled."""
+    app = get_app()
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(
+            app.url_path_for("health_check"),
+            headers={settings.profiling_header: "Sekret"},
+        )
+        not_profiled = await client.get(
+            app.url_path_for("health_check"),
+            headers={settings.profiling_header: "Wrong"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not_profiled.status_code == status.HTTP_200_OK
+    (profile_path,) = profiling_dir.iterdir()
+    assert profile_path.name.endswith(".speedscope.json")
+    assert "_GET_api-health_" in profile_path.name
+    profile = json.loads(profile_path.read_text())
+    assert profile["profiles"][0]["type"] == "sampled"
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette import status
+
+from test_app.services.readiness.checks import ReadinessChecker
+from test_app.services.redis.dependency import get_redis_pool
+from test_app.web.api.monitoring import views
+
+
+@pytest.fixture(autouse=True)
+def readiness_checker(monkeypatch: pytest.MonkeyPatch) -> ReadinessChecker:
+    """Gives every test its own readiness cache."""
+    checker = ReadinessChecker()
+    monkeypatch.setattr(views, "readiness_checker", checker)
+    return checker
+
+
+@pytest.mark.anyio
+async def test_ready(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Tests readiness with healthy dependencies."""
+    response = await client.get(fastapi_app.url_path_for("readiness_check"))
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["status"] == "ready"
+    assert set(body["checks"]) == {"database", "redis", "database_pool", "redis_pool"}
+    assert body["checks"]["database"]["latency_ms"] >= 0
+
+
+@pytest.mark.anyio
+async def test_not_ready_when_redis_is_down(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Tests failed dependency makes the worker not ready."""
+    broken_pool = ConnectionPool.from_url("redis://localhost:1")
+    fastapi_app.dependency_overrides[get_redis_pool] = lambda: broken_pool
+
+    response = await client.get(fastapi_app.url_path_for("readiness_check"))
+    await broken_pool.disconnect()
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert body["checks"]["redis"]["status"] == "fail"
+    assert body["checks"]["database"]["status"] == "ok"
+
+
+@pytest.mark.anyio
+async def test_checks_are_cached(
+    readiness_checker: ReadinessChecker,
+    _engine: AsyncEngine,
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """Tests checks are reused within cache TTL."""
+    first = await readiness_checker.check(_engine, fake_redis_pool)
+    second = await readiness_checker.check(_engine, fake_redis_pool)
+
+    assert first is second
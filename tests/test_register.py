@@ -1,11 +1,17 @@
+import asyncio
+
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from starlette import status
 
 from test_app.db.dao import UserDAO
 from test_app.db.models.users import User
+from test_app.web.api.auth.schema import UserCreate
+from test_app.web.api.exceptions import UserAlreadyExistsError
+from tests.conftest import USER_PASSWORD
 
 
 @pytest.mark.anyio
@@ -49,3 +55,32 @@ async def test_register_400_user_already_exists(
         },
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_register_same_username_concurrently(
+    _engine: AsyncEngine,
+) -> None:
+    """Tests only one of concurrent registrations with the same username wins."""
+    session_maker = async_sessionmaker(_engine, expire_on_commit=False)
+    user_create = UserCreate(username="TolpaKlonov", password=USER_PASSWORD)
+
+    async def register() -> bool:
+        async with session_maker() as session:
+            try:
+                await UserDAO(session).create_user_model(user_create)
+            except UserAlreadyExistsError:
+                return False
+            await session.commit()
+            return True
+
+    try:
+        results = await asyncio.gather(*(register() for _ in range(10)))
+    finally:
+        async with session_maker() as session:
+            await session.execute(
+                delete(User).where(User.username == user_create.username),
+            )
+            await session.commit()
+
+    assert results.count(True) == 1
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from test_app.db.dao.user import UserDAO
+from test_app.db.models.users import User
+from test_app.db.singleflight import SingleFlight, singleflight_calls
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_result() -> None:
+    """Tests concurrent calls with the same key run once and nothing is kept."""
+    flight: SingleFlight[int] = SingleFlight("test_share")
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", call) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert singleflight_calls.value(name="test_share", role="leader") == 1
+    assert singleflight_calls.value(name="test_share", role="follower") == 4
+    assert not flight._calls  # noqa: SLF001
+    assert await flight.do("key", call) == 2
+
+
+@pytest.mark.anyio
+async def test_error_is_shared() -> None:
+    """Tests followers get the error of the leader."""
+    flight: SingleFlight[int] = SingleFlight("test_error")
+
+    async def call() -> int:
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("key", call) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not flight._calls  # noqa: SLF001
+
+
+@pytest.mark.anyio
+async def test_leader_cancellation_does_not_fail_followers() -> None:
+    """Tests a follower runs the call itself when the leader is cancelled."""
+    flight: SingleFlight[str] = SingleFlight("test_cancel")
+
+    async def call() -> str:
+        await asyncio.sleep(0.05)
+        return "result"
+
+    leader = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.anyio
+async def test_user_is_loaded_once_for_concurrent_sessions(
+    dbsession: AsyncSession,
+    user: User,
+) -> None:
+    """Tests sessions share a single query and get their own user instances."""
+    # Both sessions use one connection, which can't run queries concurrently.
+    other_session = AsyncSession(bind=dbsession.bind, expire_on_commit=False)
+    leaders = singleflight_calls.value(name="user_by_id", role="leader")
+
+    first, second = await asyncio.gather(
+        UserDAO(dbsession).get_user_by_id(user.id),
+        UserDAO(other_session).get_user_by_id(user.id),
+    )
+
+    assert singleflight_calls.value(name="user_by_id", role="leader") == leaders + 1
+    assert first is not None
+    assert second is not None
+    assert first in dbsession
+    assert second in other_session
+    assert second.username == user.username
+    await other_session.close()
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette import status
+
+from test_app.db.models.tasks import Task, TaskArchive
+from test_app.db.models.users import User
+from test_app.services.archiver.archiver import (
+    TaskArchiver,
+    archive_done_tasks,
+    archived_tasks,
+    archived_tasks_per_run,
+)
+from test_app.utils.task_status import TaskStatus
+
+MIN_AGE = timedelta(days=30)
+
+
+def make_task(user: User, task_status: TaskStatus, age: timedelta) -> Task:
+    """Creates task last updated age ago."""
+    return Task(
+        title=f"{task_status.name} {age.days}",
+        description="description",
+        status=task_status,
+        user_id=user.id,
+        updated_at=datetime.now(timezone.utc) - age,
+    )
+
+
+@pytest.mark.anyio
+async def test_old_done_tasks_are_archived(
+    dbsession: AsyncSession,
+    user: User,
+) -> None:
+    """Tests only old done tasks are moved, batch by batch."""
+    old_done = [make_task(user, TaskStatus.DONE, timedelta(days=40)) for _ in range(3)]
+    kept = [
+        make_task(user, TaskStatus.DONE, timedelta(days=1)),
+        make_task(user, TaskStatus.TODO, timedelta(days=40)),
+    ]
+    dbsession.add_all([*old_done, *kept])
+    await dbsession.commit()
+    archiver = TaskArchiver(
+        [async_sessionmaker(dbsession.bind, expire_on_commit=False)],
+        interval=1,
+        min_age=MIN_AGE,
+        batch_size=2,
+        max_batches=10,
+    )
+    moved, runs = archived_tasks.value(), archived_tasks_per_run.count()
+
+    assert await archiver.run_once() == 3
+
+    assert archived_tasks.value() == moved + 3
+    assert archived_tasks_per_run.count() == runs + 1
+    task_ids = (await dbsession.scalars(select(Task.id))).all()
+    assert sorted(task_ids) == sorted(task.id for task in kept)
+    archived_ids = (await dbsession.scalars(select(TaskArchive.id))).all()
+    assert sorted(archived_ids) == sorted(task.id for task in old_done)
+
+
+@pytest.mark.anyio
+async def test_locked_tasks_are_skipped(_engine: AsyncEngine) -> None:
+    """Tests tasks locked by other transactions are left for the next run."""
+    session_factory = async_sessionmaker(_engine, expire_on_commit=False)
+    async with session_factory() as session:
+        user = User(username="ArchivedUser", hashed_password="")
+        session.add(user)
+        await session.flush()
+        session.add(make_task(user, TaskStatus.DONE, timedelta(days=40)))
+        await session.commit()
+
+    try:
+        async with _engine.connect() as locking:
+            await locking.execute(
+                text("SELECT id FROM task WHERE user_id = :id FOR UPDATE"),
+                {"id": user.id},
+            )
+            moved = await archive_done_tasks(session_factory, MIN_AGE, 10, 1)
+            assert moved == 0
+            await locking.rollback()
+
+        assert await archive_done_tasks(session_factory, MIN_AGE, 10, 1) == 1
+    finally:
+        async with session_factory() as session:
+            await session.delete(user)
+            await session.commit()
+
+
+@pytest.mark.anyio
+async def test_listing_includes_archived_on_request(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    authenticated_headers: dict,
+    user: User,
+    done_task: Task,
+) -> None:
+    """Tests archived tasks are listed only with include_archived."""
+    dbsession.add(
+        TaskArchive(
+            id=done_task.id + 1,
+            title="Archived",
+            description="description",
+            status=TaskStatus.DONE,
+            user_id=user.id,
+            updated_at=datetime.now(timezone.utc),
+        ),
+    )
+    await dbsession.commit()
+    url = fastapi_app.url_path_for("get_all_tasks")
+    headers = authenticated_headers["access_header"]
+
+    response = await client.get(url, headers=headers)
+    archived_response = await client.get(
+        url,
+        params={"include_archived": True},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Archived" not in [task["title"] for task in response.json()]
+    assert archived_response.status_code == status.HTTP_200_OK
+    assert "Archived" in [task["title"] for task in archived_response.json()]
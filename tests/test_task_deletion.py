@@ -43,7 +43,7 @@ async def test_delete_task_403_for_not_owner(
 ) -> None:
     """Tests 403 error for not owners."""
     url = fastapi_app.url_path_for("delete_task", id=todo_task.id)
-    response = await client.patch(
+    response = await client.delete(
         url,
         headers=another_user_access_header,
     )
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool, Redis
+from starlette import status
+
+from test_app.db.models.tasks import Task
+from test_app.db.models.users import User
+from test_app.services.tasks.events import (
+    TaskEventHub,
+    TaskEventType,
+    publish_task_event,
+    stream_task_events,
+    task_events_key,
+)
+
+
+@pytest.mark.anyio
+async def test_task_changes_are_published(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    authenticated_headers: dict,
+    fake_redis_pool: ConnectionPool,
+    user: User,
+) -> None:
+    """Tests create, update and delete handlers append events to user's stream."""
+    headers = authenticated_headers.get("access_header")
+    response = await client.post(
+        fastapi_app.url_path_for("create_task"),
+        json={"title": "JaloDrakona", "description": "OchenOpasno", "status": "TODO"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        entries = await redis.xrange(task_events_key(user.id))
+    task_id = json.loads(entries[0][1][b"data"])["id"]
+
+    await client.patch(
+        fastapi_app.url_path_for("task_update_partial", id=task_id),
+        json={"status": "Done"},
+        headers=headers,
+    )
+    await client.delete(
+        fastapi_app.url_path_for("delete_task", id=task_id),
+        headers=headers,
+    )
+
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        entries = await redis.xrange(task_events_key(user.id))
+    events = [json.loads(fields[b"data"]) for _, fields in entries]
+    assert [event["type"] for event in events] == ["created", "updated", "deleted"]
+    assert events[1] == {
+        "type": "updated",
+        "id": task_id,
+        "changes": {"status": "Done"},
+    }
+    assert events[2] == {"type": "deleted", "id": task_id}
+
+
+@pytest.mark.anyio
+async def test_task_events_replay_and_live(
+    fake_redis_pool: ConnectionPool,
+    todo_task: Task,
+) -> None:
+    """Tests missed events replay followed by live events."""
+    user_id = todo_task.user_id
+    await publish_task_event(fake_redis_pool, user_id, TaskEventType.CREATED, 1)
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        ((first_id, _),) = await redis.xrange(task_events_key(user_id))
+    await publish_task_event(fake_redis_pool, user_id, TaskEventType.DELETED, 1)
+
+    hub = TaskEventHub(fake_redis_pool)
+    hub.start()
+    stream = stream_task_events(hub, fake_redis_pool, user_id, first_id.decode())
+    try:
+        assert (await anext(stream)).startswith("retry:")
+        replayed = await anext(stream)
+        assert '"type":"deleted"' in replayed
+
+        live = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.1)
+        await publish_task_event(fake_redis_pool, user_id, TaskEventType.UPDATED, 1)
+        assert '"type":"updated"' in await asyncio.wait_for(live, timeout=5)
+    finally:
+        await stream.aclose()
+        await hub.stop()
+
+
+@pytest.mark.anyio
+async def test_task_events_401(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    authenticated_headers: dict,
+) -> None:
+    """Tests task events stream rejects invalid tokens."""
+    url = fastapi_app.url_path_for("task_events")
+    invalid_headers = [
+        {"Authorization": "Bearer UshelZaHlebom"},
+        authenticated_headers.get("refresh_header"),
+    ]
+
+    for header in invalid_headers:
+        response = await client.get(url, headers=header)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import AsyncGenerator
+
+import anyio
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from test_app.db.backfill import backfill_task_partitions
+from test_app.db.models.tasks import Task
+from test_app.db.utils import create_database, drop_database
+from test_app.settings import settings
+
+
+async def read_tasks(conn: AsyncConnection, table: str) -> list[Row]:
+    """Returns all tasks of the table."""
+    query = f"SELECT id, title, user_id FROM {table} ORDER BY id"  # noqa: S608
+    return list((await conn.execute(text(query))).all())
+
+
+@pytest.mark.anyio
+async def test_user_query_reads_one_partition(dbsession: AsyncSession) -> None:
+    """Tests per-user queries are pruned to a single partition."""
+    stmt = select(Task).where(Task.id == 1, Task.user_id == 1)
+    query = stmt.compile(compile_kwargs={"literal_binds": True})
+
+    plan = (await dbsession.scalars(text(f"EXPLAIN {query}"))).all()
+
+    scanned = [line for line in plan if " on task_p" in line]
+    assert len(scanned) == 1
+
+
+@pytest.fixture
+async def migrations_engine(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """Engine of an empty database for running migrations."""
+    name = f"{settings.db_base}_partitions"
+    monkeypatch.setattr(settings, "db_base", name)
+    monkeypatch.setattr(settings, "db_task_partitions", 4)
+    await create_database(name)
+    engine = create_async_engine(str(settings.db_url))
+    yield engine
+    await engine.dispose()
+    await drop_database(name)
+
+
+async def migrate(revision: str, downgrade: bool = False) -> None:
+    """Runs migrations to the revision."""
+    config = Config()
+    config.set_main_option(
+        "script_location",
+        str(Path(__file__).parents[1] / "test_app" / "db" / "migrations"),
+    )
+    migration = command.downgrade if downgrade else command.upgrade
+    await anyio.to_thread.run_sync(migration, config, revision)
+
+
+@pytest.mark.anyio
+async def test_online_backfill(migrations_engine: AsyncEngine) -> None:
+    """Tests tasks written before and during backfill end up partitioned."""
+    await migrate("3b9f2c1d7a64")
+    async with migrations_engine.begin() as conn:
+        await conn.execute(
+            text(
+                'INSERT INTO "user" (id, username, hashed_password) '
+                "SELECT g, 'user' || g, '' FROM generate_series(1, 10) g",
+            ),
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO task (title, description, status, user_id) "
+                "SELECT 'task ' || g, '', 'TODO', g % 10 + 1 "
+                "FROM generate_series(1, 50) g",
+            ),
+        )
+
+    await migrate("5c2e8a4b1f03")
+    # Writes during backfill are copied by the trigger.
+    async with migrations_engine.begin() as conn:
+        await conn.execute(text("UPDATE task SET title = 'updated' WHERE id = 1"))
+        await conn.execute(text("DELETE FROM task WHERE id = 2"))
+        await conn.execute(
+            text(
+                "INSERT INTO task (title, description, status, user_id) "
+                "VALUES ('new', '', 'DONE', 1)",
+            ),
+        )
+    assert await backfill_task_partitions(migrations_engine, batch_size=7) == 50
+    async with migrations_engine.connect() as conn:
+        expected = await read_tasks(conn, "task")
+        assert await read_tasks(conn, "task_partitioned") == expected
+
+    await migrate("head")
+    async with migrations_engine.connect() as conn:
+        assert await read_tasks(conn, "task") == expected
+        partitions = await conn.scalar(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = 'task'::regclass"),
+        )
+        assert partitions == 4
+        # Deleting a user still deletes their tasks.
+        await conn.execute(text('DELETE FROM "user" WHERE id = 1'))
+        tasks_left = text("SELECT count(*) FROM task WHERE user_id = 1")
+        assert await conn.scalar(tasks_left) == 0
+        await conn.rollback()
+
+    await migrate("base", downgrade=True)
@@ -0,0 +1,224 @@
+from pathlib import Path
+from typing import AsyncGenerator
+
+import anyio
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette import status
+
+from test_app.db.models.tasks import Task
+from test_app.db.models.users import User
+from test_app.db.rebalance import move_user, pin_users, rebalance
+from test_app.db.shards import MAX_TASK_SHARDS, TaskShards, jump_hash, task_shards
+from test_app.db.utils import create_database, drop_database
+from test_app.settings import settings
+
+SHARDS_COUNT = 2
+
+
+def shard_url(name: str) -> str:
+    """Returns URL of database with given name."""
+    return str(settings.db_url.with_path(f"/{name}"))
+
+
+@pytest.fixture(scope="session")
+async def shard_urls() -> AsyncGenerator[list[str], None]:
+    """Creates task shard databases like migrations do."""
+    from test_app.db.meta import meta
+    from test_app.db.models import load_all_models
+
+    load_all_models()
+    names = [f"{settings.db_base}_tasks_{shard}" for shard in range(SHARDS_COUNT)]
+    for shard, name in enumerate(names):
+        await create_database(name)
+        engine = create_async_engine(shard_url(name))
+        async with engine.begin() as conn:
+            await conn.run_sync(meta.create_all)
+            await conn.execute(
+                text("ALTER TABLE task DROP CONSTRAINT fk_task_user_id_user"),
+            )
+            await conn.execute(
+                text(
+                    f"ALTER SEQUENCE task_id_seq INCREMENT BY {MAX_TASK_SHARDS} "
+                    f"RESTART WITH {shard + 1}",
+                ),
+            )
+        await engine.dispose()
+
+    yield [shard_url(name) for name in names]
+
+    for name in names:
+        await drop_database(name)
+
+
+@pytest.fixture
+async def sharded(shard_urls: list[str]) -> AsyncGenerator[TaskShards, None]:
+    """Enables task sharding."""
+    task_shards.configure(shard_urls)
+    yield task_shards
+    for engine in task_shards.engines:
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE task"))
+    await task_shards.dispose()
+
+
+async def shard_task_ids(shard: int, user_id: int) -> list[int]:
+    """Returns ids of user's tasks stored in the shard."""
+    async with task_shards.session(shard) as session:
+        result = await session.scalars(
+            select(Task.id).where(Task.user_id == user_id).order_by(Task.id),
+        )
+        return list(result.all())
+
+
+async def create_task(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    headers: dict,
+    title: str,
+) -> None:
+    """Creates task through the API."""
+    response = await client.post(
+        fastapi_app.url_path_for("create_task"),
+        json={"title": title, "description": "description", "status": "TODO"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_jump_hash_moves_few_keys() -> None:
+    """Tests that only keys of the added bucket move when a bucket is added."""
+    keys = range(10_000)
+    before = [jump_hash(key, 4) for key in keys]
+    after = [jump_hash(key, 5) for key in keys]
+
+    moved = [new for old, new in zip(before, after) if old != new]
+    assert set(moved) == {4}
+    assert 1_600 < len(moved) < 2_400
+    assert all(1_600 < before.count(bucket) * 0.8 < 2_400 for bucket in range(4))
+
+
+@pytest.mark.anyio
+async def test_tasks_are_stored_in_user_shard(
+    sharded: TaskShards,
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    user: User,
+    another_user: User,
+    authenticated_headers: dict,
+    another_user_access_header: dict,
+) -> None:
+    """Tests tasks are routed by user and listed from all shards."""
+    user_shard = sharded.shard_for(user)
+    another_user.task_shard = 1 - user_shard
+    await dbsession.commit()
+
+    await create_task(fastapi_app, client, authenticated_headers["access_header"], "1")
+    await create_task(fastapi_app, client, another_user_access_header, "2")
+
+    assert len(await shard_task_ids(user_shard, user.id)) == 1
+    assert not await shard_task_ids(1 - user_shard, user.id)
+    assert len(await shard_task_ids(1 - user_shard, another_user.id)) == 1
+    response = await client.get(
+        fastapi_app.url_path_for("get_all_tasks"),
+        headers=authenticated_headers["access_header"],
+    )
+    assert sorted(task["title"] for task in response.json()) == ["1", "2"]
+
+
+@pytest.mark.anyio
+async def test_move_user(
+    sharded: TaskShards,
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    user: User,
+    authenticated_headers: dict,
+) -> None:
+    """Tests user's tasks keep ids when moved and requests follow them."""
+    headers = authenticated_headers["access_header"]
+    await create_task(fastapi_app, client, headers, "1")
+    await create_task(fastapi_app, client, headers, "2")
+    source = sharded.shard_for(user)
+    task_ids = await shard_task_ids(source, user.id)
+
+    assert await move_user(dbsession, user.id, 1 - source) == 2
+
+    assert user.task_shard == 1 - source
+    assert await shard_task_ids(1 - source, user.id) == task_ids
+    assert not await shard_task_ids(source, user.id)
+    response = await client.patch(
+        fastapi_app.url_path_for("task_update_partial", id=task_ids[0]),
+        json={"status": "Done"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_rebalance_moves_pinned_users_back(
+    sharded: TaskShards,
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    user: User,
+    another_user: User,
+    authenticated_headers: dict,
+) -> None:
+    """Tests rebalancing moves users to their hashed shards and unpins them."""
+    await create_task(fastapi_app, client, authenticated_headers["access_header"], "1")
+    hashed_shard = sharded.hashed_shard(user.id)
+    await move_user(dbsession, user.id, 1 - hashed_shard)
+    assert await pin_users(dbsession) == 1
+
+    assert await rebalance(dbsession) == 1
+
+    assert user.task_shard is None
+    assert another_user.task_shard is None
+    assert len(await shard_task_ids(hashed_shard, user.id)) == 1
+    assert not await shard_task_ids(1 - hashed_shard, user.id)
+
+
+@pytest.mark.anyio
+async def test_migrations_run_on_every_shard(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests migrations detach shards from the user table."""
+    primary = f"{settings.db_base}_migrations"
+    shard = f"{primary}_shard"
+    monkeypatch.setattr(settings, "db_base", primary)
+    monkeypatch.setattr(settings, "db_task_shard_urls", [shard_url(shard)])
+    await create_database(primary)
+    await create_database(shard)
+    config = Config()
+    config.set_main_option(
+        "script_location",
+        str(Path(__file__).parents[1] / "test_app" / "db" / "migrations"),
+    )
+    foreign_keys = text(
+        "SELECT count(*) FROM information_schema.table_constraints "
+        "WHERE table_name = 'task' AND constraint_type = 'FOREIGN KEY'",
+    )
+    increment = text(
+        "SELECT increment_by FROM pg_sequences WHERE sequencename = 'task_id_seq'",
+    )
+
+    try:
+        await anyio.to_thread.run_sync(command.upgrade, config, "head")
+        for name, expected_foreign_keys, expected_increment in (
+            (primary, 1, 1),
+            (shard, 0, MAX_TASK_SHARDS),
+        ):
+            engine = create_async_engine(shard_url(name))
+            async with engine.connect() as conn:
+                assert await conn.scalar(foreign_keys) == expected_foreign_keys
+                assert await conn.scalar(increment) == expected_increment
+            await engine.dispose()
+        await anyio.to_thread.run_sync(command.downgrade, config, "base")
+    finally:
+        await drop_database(shard)
+        await drop_database(primary)
@@ -96,3 +96,27 @@ async def test_partial_update_task_403_for_not_existing_task(
 
     assert not_existing_task is None
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.anyio
+async def test_partial_update_task_keeps_not_owned_task(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    todo_task: Task,
+    another_user_access_header: dict,
+) -> None:
+    """Tests not owner's update doesn't touch the task."""
+    url = fastapi_app.url_path_for("task_update_partial", id=todo_task.id)
+    old_title = todo_task.title
+
+    response = await client.patch(
+        url,
+        json={"title": "_new"},
+        headers=another_user_access_header,
+    )
+
+    task = await TaskDAO(dbsession).get_task_by_id(todo_task.id)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert task is not None
+    assert task.title == old_title
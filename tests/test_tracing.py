@@ -0,0 +1,95 @@
+from typing import AsyncGenerator, Sequence
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from test_app.db.models.users import User
+from test_app.services.tracing.exporter import BatchSpanProcessor, encode_spans
+from test_app.services.tracing.tracer import (
+    Span,
+    SpanKind,
+    format_traceparent,
+    parse_traceparent,
+    tracer,
+)
+from test_app.web.middlewares.tracing import TracingMiddleware
+from tests.conftest import USER_PASSWORD
+
+
+class MemorySpanExporter:
+    """Keeps exported spans in memory."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Stores spans."""
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+async def span_processor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[BatchSpanProcessor, None]:
+    """Enables tracing with in-memory exporter."""
+    processor = BatchSpanProcessor(MemorySpanExporter())
+    monkeypatch.setattr(tracer, "processor", processor)
+    yield processor
+    await processor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_traceparent_propagation(
+    span_processor: BatchSpanProcessor,
+    fastapi_app: FastAPI,
+) -> None:
+    """Tests server span continues incoming trace."""
+    fastapi_app.add_middleware(TracingMiddleware)
+    incoming = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+    async with AsyncClient(app=fastapi_app, base_url="http://test") as client:
+        response = await client.get(
+            fastapi_app.url_path_for("health_check"),
+            headers={"traceparent": incoming},
+        )
+    await span_processor.force_flush()
+
+    assert response.status_code == status.HTTP_200_OK
+    (span,) = span_processor.exporter.spans  # type: ignore[attr-defined]
+    assert span.kind == SpanKind.SERVER
+    assert span.name == "GET /api/health"
+    assert span.parent_span_id == "b7ad6b7169203331"
+    assert span.context.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert response.headers["traceparent"] == format_traceparent(span.context)
+
+
+@pytest.mark.anyio
+async def test_login_spans(
+    span_processor: BatchSpanProcessor,
+    fastapi_app: FastAPI,
+    user: User,
+) -> None:
+    """Tests login records bcrypt and jwt spans inside the route span."""
+    fastapi_app.add_middleware(TracingMiddleware)
+
+    async with AsyncClient(app=fastapi_app, base_url="http://test") as client:
+        await client.post(
+            fastapi_app.url_path_for("login_user"),
+            data={"username": user.username, "password": USER_PASSWORD},
+        )
+    await span_processor.force_flush()
+
+    spans = {span.name: span for span in span_processor.exporter.spans}  # type: ignore[attr-defined]
+    route_span = spans["POST /api/auth/login"]
+    for name in ("bcrypt.verify", "jwt.encode", "redis.setex"):
+        assert spans[name].parent_span_id == route_span.context.span_id
+    encoded = encode_spans(list(spans.values()))
+    assert len(encoded["resourceSpans"][0]["scopeSpans"][0]["spans"]) == len(spans)
+
+
+def test_invalid_traceparent_ignored() -> None:
+    """Tests malformed traceparent headers start a new trace."""
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
@@ -0,0 +1,79 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from test_app.db.dao.user import UserDAO
+from test_app.db.loaders import UserLoader, user_loader, user_loader_batch_size
+from test_app.db.models.users import User
+
+
+@pytest.fixture
+async def loader(dbsession: AsyncSession) -> AsyncGenerator[UserLoader, None]:
+    """Global user loader reading through the test transaction."""
+    user_loader.configure(
+        async_sessionmaker(dbsession.bind, expire_on_commit=False),
+        batch_size=100,
+        window=0.01,
+    )
+    yield user_loader
+    await user_loader.close()
+
+
+@pytest.mark.anyio
+async def test_concurrent_lookups_are_batched(
+    loader: UserLoader,
+    user: User,
+    another_user: User,
+) -> None:
+    """Tests ids requested within the window are loaded with one query."""
+    batches = user_loader_batch_size.count()
+
+    first, second, missing, again = await asyncio.gather(
+        loader.load(user.id),
+        loader.load(another_user.id),
+        loader.load(-1),
+        loader.load(user.id),
+    )
+
+    assert user_loader_batch_size.count() == batches + 1
+    assert first is not None
+    assert first.username == user.username
+    assert second is not None
+    assert second.username == another_user.username
+    assert missing is None
+    assert again is first
+
+
+@pytest.mark.anyio
+async def test_full_batch_is_sent_early(
+    loader: UserLoader,
+    user: User,
+    another_user: User,
+) -> None:
+    """Tests a batch is sent once it reaches the batch size."""
+    loader.batch_size = 1
+    batches = user_loader_batch_size.count()
+
+    await asyncio.gather(loader.load(user.id), loader.load(another_user.id))
+
+    assert user_loader_batch_size.count() == batches + 2
+
+
+@pytest.mark.anyio
+async def test_dao_uses_loader(
+    loader: UserLoader,
+    dbsession: AsyncSession,
+    user: User,
+) -> None:
+    """Tests DAO returns the batched user attached to its session."""
+    batches = user_loader_batch_size.count()
+    dbsession.expunge(user)
+
+    loaded = await UserDAO(dbsession).get_user_by_id(user.id)
+
+    assert user_loader_batch_size.count() == batches + 1
+    assert loaded is not None
+    assert loaded in dbsession
+    assert loaded.username == user.username
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette import status
+
+from test_app.services.warmup.warmup import warm_up_db, warm_up_redis
+
+
+@pytest.mark.anyio
+async def test_warm_up_opens_connections(
+    _engine: AsyncEngine,
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """Tests warm-up leaves opened connections in the pools."""
+    await warm_up_db(_engine, connections_count=3)
+    await warm_up_redis(fake_redis_pool, connections_count=3)
+
+    assert _engine.pool.checkedin() >= 3  # type: ignore[attr-defined]
+    assert len(fake_redis_pool._available_connections) == 3  # noqa: SLF001
+
+
+@pytest.mark.anyio
+async def test_not_ready_until_warmed_up(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Tests readiness endpoint waits for warm-up."""
+    url = fastapi_app.url_path_for("readiness_check")
+    fastapi_app.state.warmup = asyncio.get_running_loop().create_future()
+
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    fastapi_app.state.warmup.set_result(None)
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK